@@ -1,12 +1,13 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, user
+from app.api.v1.endpoints import auth, user, admin
 from app.api.v1.endpoints import debug
 from app.core.config import settings
 
 api_router = APIRouter()
 api_router.include_router(auth.router)
 api_router.include_router(user.router)
+api_router.include_router(admin.router)
 
 if settings.DEBUG:
     api_router.include_router(debug.router)
\ No newline at end of file
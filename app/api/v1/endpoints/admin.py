@@ -0,0 +1,85 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.db.mongo import MongoUserDB
+from app.core.config import settings
+from app.core.auth import require_admin
+from app.db.dependencies import get_user_db
+from app.schemas.user import UserType, Locality, UserPageResponse, UserImportResponse
+from app.services.user_service import list_users, export_users
+from app.services.import_service import iter_records, import_users, CSV, NDJSON
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+@router.get(
+    "/users",
+    response_model=UserPageResponse,
+    summary="List users",
+    description="Returns one page of users ordered by creation date. Pass `nextCursor` from the previous page as `cursor` to continue.",
+    responses={
+        200: {"description": "Page of users"},
+        400: {"description": "Invalid cursor"},
+        401: {"description": "Invalid admin API key"},
+        403: {"description": "Admin API is disabled"}
+    }
+)
+async def get_users(
+    limit: int = Query(50, ge=1, le=settings.USER_PAGE_MAX_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    userType: Optional[UserType] = Query(None, description="Only users of this type"),
+    locality: Optional[Locality] = Query(None, description="Only clinics in this locality"),
+    user_db: MongoUserDB = Depends(get_user_db),
+):
+    return await list_users(user_db, limit, cursor, userType, locality)
+
+
+@router.get(
+    "/users/export",
+    summary="Export users as NDJSON",
+    description="Streams every matching user as one JSON object per line, without loading the collection into memory.",
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "NDJSON stream of users", "content": {"application/x-ndjson": {}}},
+        401: {"description": "Invalid admin API key"},
+        403: {"description": "Admin API is disabled"}
+    }
+)
+async def export_users_endpoint(
+    userType: Optional[UserType] = Query(None, description="Only users of this type"),
+    locality: Optional[Locality] = Query(None, description="Only clinics in this locality"),
+    user_db: MongoUserDB = Depends(get_user_db),
+):
+    return StreamingResponse(
+        export_users(user_db, userType, locality),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="users.ndjson"'}
+    )
+
+
+@router.post(
+    "/users/import",
+    response_model=UserImportResponse,
+    summary="Bulk import users",
+    description="Imports owners or clinics from an NDJSON body, or from CSV when `Content-Type` is `text/csv`. Each row uses the registration fields; `confirmPassword` may be omitted. Returns a per-row report.",
+    responses={
+        200: {"description": "Per-row import report"},
+        401: {"description": "Invalid admin API key"},
+        403: {"description": "Admin API is disabled"},
+        413: {"description": "Too many rows or bytes"}
+    }
+)
+async def import_users_endpoint(
+    request: Request,
+    userType: UserType = Query(..., description="Type of every user in the file"),
+    user_db: MongoUserDB = Depends(get_user_db),
+):
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > settings.IMPORT_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Import files are limited to {settings.IMPORT_MAX_BYTES} bytes."
+        )
+
+    fmt = CSV if request.headers.get("content-type", "").startswith("text/csv") else NDJSON
+    return await import_users(iter_records(request.stream(), fmt), fmt, userType, user_db)
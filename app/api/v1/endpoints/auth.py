@@ -1,20 +1,26 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.security import HTTPAuthorizationCredentials
 
 from app.db.mongo import MongoUserDB
 from app.core.auth import get_current_user, security
+from app.core.throttle import LoginThrottle, get_login_throttle, client_ip
+from app.utils.response_builder import json_response
 from app.db.mongo_token_store import MongoRevokedTokenStore
-from app.db.dependencies import get_user_db, get_revoked_token_store
+from app.db.mongo_email_outbox import MongoEmailOutbox
+from app.db.mongo_refresh_token_store import MongoRefreshTokenStore
+from app.db.dependencies import get_user_db, get_revoked_token_store, get_email_outbox, get_refresh_token_store
 
 from app.services.auth_service import(
-    verify_user_token,
-    register_user, authenticate_user, logout_user,
+    verify_user_token, verify_user_tokens,
+    register_user, authenticate_user, logout_user, refresh_session,
     change_password,  initiate_password_reset, reset_password
 )
 
 from app.schemas.auth import(
     ResetPasswordRequest, ChangePasswordRequest, ForgotPasswordRequest,
-    BaseResponse, UserLoginRequest, UserLoginResponse, TokenVerificationResponse
+    BaseResponse, UserLoginRequest, UserLoginResponse, TokenVerificationResponse,
+    RefreshTokenRequest, RefreshTokenResponse, LogoutRequest,
+    BatchTokenVerificationRequest, BatchTokenVerificationResponse
 )
 
 from app.schemas.user import(
@@ -29,21 +35,49 @@ router = APIRouter(prefix="/auth", tags=["auth"])
     "/login",
     response_model=UserLoginResponse,
     summary="User login",
-    description="Authenticates a user using their email and password and returns an access token.",
+    description="Authenticates a user using their email and password and returns an access token and a refresh token.",
     responses={
         200: {"description": "User authenticated successfully"},
-        401: {"description": "Invalid email or password"}
+        401: {"description": "Invalid email or password"},
+        429: {"description": "Too many login attempts; see the Retry-After header"}
     }
 )
-async def login(user: UserLoginRequest, user_db: MongoUserDB = Depends(get_user_db)):
-    return await authenticate_user(user.email, user.password.get_secret_value(), user_db)
+async def login(
+    user: UserLoginRequest,
+    request: Request,
+    user_db: MongoUserDB = Depends(get_user_db),
+    refresh_store: MongoRefreshTokenStore = Depends(get_refresh_token_store),
+    throttle: LoginThrottle | None = Depends(get_login_throttle),
+):
+    return json_response(await authenticate_user(
+        user.email, user.password.get_secret_value(), user_db,
+        refresh_store=refresh_store, throttle=throttle, client_ip=client_ip(request)
+    ))
+
+
+@router.post(
+    "/refresh",
+    response_model=RefreshTokenResponse,
+    summary="Refresh access token",
+    description="Exchanges a refresh token for a new access token and a new refresh token. Each refresh token works once; presenting a used one revokes the whole session.",
+    responses={
+        200: {"description": "Tokens refreshed"},
+        401: {"description": "Invalid, expired, revoked or reused refresh token"}
+    }
+)
+async def refresh(
+    data: RefreshTokenRequest,
+    user_db: MongoUserDB = Depends(get_user_db),
+    refresh_store: MongoRefreshTokenStore = Depends(get_refresh_token_store),
+):
+    return await refresh_session(data.refreshToken, user_db, refresh_store)
 
 
 @router.post(
     "/logout",
     response_model=BaseResponse,
     summary="Logout current user",
-    description="Revokes the access token, effectively logging the user out.",
+    description="Revokes the access token and, when given, the session's refresh token.",
     responses={
         200: {
             "description": "Logged out successfully",
@@ -60,11 +94,13 @@ async def login(user: UserLoginRequest, user_db: MongoUserDB = Depends(get_user_
     }
 )
 async def logout(
+    data: LogoutRequest | None = None,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     store: MongoRevokedTokenStore = Depends(get_revoked_token_store),
+    refresh_store: MongoRefreshTokenStore = Depends(get_refresh_token_store),
 ):
     token = credentials.credentials
-    return await logout_user(token, store)
+    return await logout_user(token, store, data.refreshToken if data else None, refresh_store)
 
 @router.post(
     "/register/owner",
@@ -77,8 +113,12 @@ async def logout(
         400: {"description": "Email already registered"}
     }
 )
-async def register_owner(data: OwnerRegister, user_db: MongoUserDB = Depends(get_user_db)):
-    return await register_user(data, UserType.OWNER, user_db)
+async def register_owner(
+    data: OwnerRegister,
+    user_db: MongoUserDB = Depends(get_user_db),
+    refresh_store: MongoRefreshTokenStore = Depends(get_refresh_token_store),
+):
+    return json_response(await register_user(data, UserType.OWNER, user_db, refresh_store), status_code=201)
 
 
 @router.post(
@@ -92,8 +132,12 @@ async def register_owner(data: OwnerRegister, user_db: MongoUserDB = Depends(get
         400: {"description": "Email already registered"}
     }
 )
-async def register_clinic(data: ClinicRegister, user_db: MongoUserDB = Depends(get_user_db)):
-    return await register_user(data, UserType.CLINIC, user_db)
+async def register_clinic(
+    data: ClinicRegister,
+    user_db: MongoUserDB = Depends(get_user_db),
+    refresh_store: MongoRefreshTokenStore = Depends(get_refresh_token_store),
+):
+    return json_response(await register_user(data, UserType.CLINIC, user_db, refresh_store), status_code=201)
 
 
 @router.post(
@@ -116,8 +160,12 @@ async def register_clinic(data: ClinicRegister, user_db: MongoUserDB = Depends(g
         422: {"description": "Validation error"}
     }
 )
-async def forgot_password(request: ForgotPasswordRequest, user_db: MongoUserDB = Depends(get_user_db)):
-    return await initiate_password_reset(request.email, user_db)
+async def forgot_password(
+    request: ForgotPasswordRequest,
+    user_db: MongoUserDB = Depends(get_user_db),
+    outbox: MongoEmailOutbox = Depends(get_email_outbox),
+):
+    return await initiate_password_reset(request.email, user_db, outbox)
 
 
 @router.post(
@@ -135,8 +183,9 @@ async def reset_password_endpoint(
     data: ResetPasswordRequest,
     user_db: MongoUserDB = Depends(get_user_db),
     store: MongoRevokedTokenStore = Depends(get_revoked_token_store),
+    refresh_store: MongoRefreshTokenStore = Depends(get_refresh_token_store),
 ):
-    return await reset_password(data.token, data.newPassword.get_secret_value(), user_db, store)
+    return await reset_password(data.token, data.newPassword.get_secret_value(), user_db, store, refresh_store)
 
 
 @router.put(
@@ -153,8 +202,12 @@ async def change_password_endpoint(
     data: ChangePasswordRequest,
     current_user: dict = Depends(get_current_user),
     user_db: MongoUserDB = Depends(get_user_db),
+    refresh_store: MongoRefreshTokenStore = Depends(get_refresh_token_store),
 ):
-    return await change_password(current_user, data.currentPassword.get_secret_value(), data.newPassword.get_secret_value(), user_db)
+    return await change_password(
+        current_user, data.currentPassword.get_secret_value(), data.newPassword.get_secret_value(),
+        user_db, refresh_store
+    )
 
 
 @router.post(
@@ -175,3 +228,20 @@ async def verify_token_API(
     token = credentials.credentials
     return await verify_user_token(token, user_db, store)
 
+
+@router.post(
+    "/verify-tokens",
+    response_model=BatchTokenVerificationResponse,
+    summary="Verify access tokens in batch",
+    description="Validates several access tokens in one call, resolving revocations and users with one query each. Returns one result per token in request order.",
+    responses={
+        200: {"description": "Per-token verification results"},
+        422: {"description": "Empty or oversized token list"}
+    }
+)
+async def verify_tokens_API(
+    data: BatchTokenVerificationRequest,
+    user_db: MongoUserDB = Depends(get_user_db),
+    store: MongoRevokedTokenStore = Depends(get_revoked_token_store),
+):
+    return await verify_user_tokens(data.tokens, user_db, store)
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from app.db.mongo import MongoUserDB
+from app.db.projections import EXISTENCE
 from app.db.dependencies import get_user_db
 from app.core.tokens import create_reset_token
 from app.core.config import settings
@@ -13,7 +14,7 @@ async def generate_reset_token_test(request: ForgotPasswordRequest, user_db: Mon
     if not settings.DEBUG:
         raise HTTPException(status_code=403, detail="Not allowed")
     
-    user = await user_db.get_by_email(request.email.strip().lower())
+    user = await user_db.get_by_email(request.email.strip().lower(), EXISTENCE)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends
 
 from app.db.mongo import MongoUserDB
 from app.schemas.auth import BaseResponse
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, get_current_user_public
 from app.db.dependencies import get_user_db
+from app.utils.response_builder import json_response
 from app.schemas.user import OwnerUpdate, OwnerOut, ClinicUpdate, ClinicOut
 from app.services.user_service import get_user_profile, update_user_profile, delete_user_account
 
@@ -21,10 +22,10 @@ router = APIRouter(prefix="/user", tags=["user"])
     }
 )
 async def get_profile(
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_public),
     user_db: MongoUserDB = Depends(get_user_db),
 ):
-    return await get_user_profile(current_user, user_db)
+    return json_response(await get_user_profile(current_user, user_db))
 
 @router.patch(
     "/profile",
@@ -44,7 +45,7 @@ async def update_profile(
     user_db: MongoUserDB = Depends(get_user_db),
 ):
     updates = data.model_dump(exclude_unset=True)
-    return await update_user_profile(current_user, updates, user_db)
+    return json_response(await update_user_profile(current_user, updates, user_db))
 
 @router.delete(
     "/account",
@@ -1,18 +1,23 @@
+import hmac
 from fastapi import Depends, HTTPException
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, APIKeyHeader
 
 from app.db.mongo import MongoUserDB
+from app.db.projections import AUTH, PUBLIC
+from app.core.config import settings
 from app.core.tokens import verify_token, TokenType
 from app.db.mongo_token_store import MongoRevokedTokenStore
 from app.db.dependencies import get_user_db, get_revoked_token_store
 
 security = HTTPBearer(description="Paste JWT token here.")
+admin_key_header = APIKeyHeader(name="X-Admin-Key", description="Admin API key.", auto_error=False)
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    user_db: MongoUserDB = Depends(get_user_db),
-    store: MongoRevokedTokenStore = Depends(get_revoked_token_store),
-):
+async def _load_current_user(
+    credentials: HTTPAuthorizationCredentials,
+    user_db: MongoUserDB,
+    store: MongoRevokedTokenStore,
+    profile: str,
+) -> dict:
     token = credentials.credentials
     payload = await verify_token(token, TokenType.ACCESS, store)
     user_id = payload.get("sub")
@@ -20,8 +25,30 @@ async def get_current_user(
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid or expired token.")
 
-    user = await user_db.get_by_id(user_id)
+    user = await user_db.get_by_id(user_id, profile)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token.")
 
-    return user
\ No newline at end of file
+    return user
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user_db: MongoUserDB = Depends(get_user_db),
+    store: MongoRevokedTokenStore = Depends(get_revoked_token_store),
+):
+    return await _load_current_user(credentials, user_db, store, AUTH)
+
+async def get_current_user_public(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user_db: MongoUserDB = Depends(get_user_db),
+    store: MongoRevokedTokenStore = Depends(get_revoked_token_store),
+):
+    # For handlers that read the profile: one PUBLIC read also serves their later lookups
+    return await _load_current_user(credentials, user_db, store, PUBLIC)
+
+async def require_admin(api_key: str | None = Depends(admin_key_header)):
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin API is disabled.")
+
+    if not api_key or not hmac.compare_digest(api_key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin API key.")
@@ -14,12 +14,88 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     RESET_TOKEN_EXPIRE_MINUTES: int
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # When False, access tokens are not checked against revoked_tokens: logout and password
+    # changes revoke refresh tokens, and issued access tokens stay valid until they expire
+    ACCESS_TOKEN_REVOCATION_CHECK: bool = True
+    
+    # JWT backend ("jose", "pyjwt" or "hmac" for HS* only) and verified-payload cache size
+    JWT_CODEC: str = "jose"
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+    
+    # Asymmetric signing (RS*/ES* algorithms): <kid>.pem files, every key verifies and is published
+    JWT_KEYS_DIR: str | None = None
+    JWT_ACTIVE_KID: str | None = None
+    JWKS_CACHE_MAX_AGE_SECONDS: int = 300
+    
+    # Password Hashing
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 5.0
+    
+    BATCH_VERIFY_MAX_TOKENS: int = 500
+    
+    # Metrics: served at {API_V1_STR}/metrics, or on this port only when set
+    METRICS_PORT: int | None = None
+    
+    # Login Throttling ("memory" per worker, or "mongo" to also share counters across workers)
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_THROTTLE_BACKEND: str = "memory"
+    LOGIN_THROTTLE_WINDOW_SECONDS: int = 60
+    LOGIN_THROTTLE_IP_LIMIT: int = 30
+    LOGIN_THROTTLE_EMAIL_LIMIT: int = 10
+    LOGIN_THROTTLE_MAX_KEYS: int = 100_000
+    # Only enable behind a proxy that appends the client address to X-Forwarded-For
+    LOGIN_THROTTLE_TRUST_FORWARDED_FOR: bool = False
+    
+    # Admin API (user listing/export); disabled unless a key is set
+    ADMIN_API_KEY: str | None = None
+    USER_PAGE_MAX_SIZE: int = 100
+    USER_EXPORT_BATCH_SIZE: int = 500
+    IMPORT_MAX_ROWS: int = 10_000
+    IMPORT_MAX_BYTES: int = 10 * 1024 * 1024
+    IMPORT_CHUNK_SIZE: int = 500
+    IMPORT_HASH_PARALLELISM: int = 2
+    
+    # Revocation Filter
+    REVOCATION_FILTER_ENABLED: bool = True
+    REVOCATION_FILTER_CAPACITY: int = 100_000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    REVOCATION_FILTER_POLL_SECONDS: float = 1.0
+    REVOCATION_FILTER_STALENESS_SECONDS: float = 5.0
+    REVOCATION_FILTER_REBUILD_SECONDS: float = 300.0
+    # Also match revocations stored by full token (pre-jti) and stamp ones written without revokedAt
+    # by workers of the previous release; safe to disable once the rollout is done and they expire
+    REVOCATION_LEGACY_LOOKUP: bool = True
+    
+    # User Cache: per worker and without password hashes; other fields (including deletion) may be
+    # seen up to USER_CACHE_TTL_SECONDS late on workers that did not make the change
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_MAX_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: float = 30.0
     
     # Email Configuration
     GMAIL_USER: str
     GMAIL_PASS: str
     EMAIL_FROM_NAME: str = "PetMatch"
     EMAIL_TEMPLATES_DIR: str = "app/templates"
+    EMAIL_TEMPLATES_BYTECODE_CACHE_DIR: str | None = None
+    SMTP_HOST: str = "smtp.gmail.com"
+    SMTP_PORT: int = 465
+    SMTP_USE_SSL: bool = True
+    SMTP_USE_AUTH: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    SMTP_POOL_SIZE: int = 2
+    
+    # Email Outbox
+    EMAIL_OUTBOX_WORKERS: int = 2
+    EMAIL_OUTBOX_POLL_SECONDS: float = 2.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    EMAIL_OUTBOX_BACKOFF_SECONDS: float = 5.0
+    EMAIL_OUTBOX_LEASE_SECONDS: float = 120.0
+    EMAIL_OUTBOX_DRAIN_TIMEOUT_SECONDS: float = 10.0
     
     # Frontend URLs
     FRONTEND_URL: str
@@ -29,6 +105,35 @@ class Settings(BaseSettings):
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "petmatchDB"
     TEST_DB_NAME: str = "petmatchDB_test"
+    # Used when MONGODB_URL is unreachable at startup; leave empty to fail instead
+    MONGODB_FALLBACK_URL: str | None = "mongodb://localhost:27017"
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 10000
+    
+    # Startup: serve immediately and report readiness on /ready instead of blocking on MongoDB
+    STARTUP_IN_BACKGROUND: bool = False
+    STARTUP_INDEXES_IN_BACKGROUND: bool = False
+    
+    # Event-loop lag sampling; the watchdog (on by default in DEBUG) logs the stack of blocking code
+    LOOP_LAG_SAMPLE_SECONDS: float = 0.25
+    LOOP_WATCHDOG_ENABLED: bool | None = None
+    LOOP_WATCHDOG_THRESHOLD_MS: float = 200.0
+    
+    # /health/deep: probe results are cached; any value past its limit reports the instance overloaded
+    HEALTH_CACHE_SECONDS: float = 1.0
+    HEALTH_MONGO_TIMEOUT_SECONDS: float = 1.0
+    HEALTH_MAX_MONGO_LATENCY_MS: float = 250.0
+    HEALTH_MAX_POOL_SATURATION: float = 0.9
+    HEALTH_MAX_HASH_QUEUE_SATURATION: float = 0.9
+    HEALTH_MAX_LOOP_LAG_MS: float = 100.0
+    
+    # Connection pool (per worker process) and wire compression ("zstd,snappy,zlib", in preference order)
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: int | None = None
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int | None = None
+    MONGODB_COMPRESSORS: str | None = None
+    # Commands slower than this are logged with their filter shape (values redacted); 0 disables
+    MONGODB_SLOW_QUERY_MS: int = 100
     
     # CORS
     BACKEND_CORS_ORIGINS: str | List[str] = ["*"]
@@ -42,6 +147,50 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
     
+    @field_validator("MONGODB_COMPRESSORS")
+    @classmethod
+    def validate_mongodb_compressors(cls, v: str | None) -> str | None:
+        if v and any(c.strip() not in ("zstd", "snappy", "zlib") for c in v.split(",")):
+            raise ValueError("MONGODB_COMPRESSORS must be a comma-separated list of 'zstd', 'snappy' and 'zlib'")
+        return v
+    
+    @field_validator("PASSWORD_HASH_EXECUTOR")
+    @classmethod
+    def validate_password_hash_executor(cls, v: str) -> str:
+        if v not in ("thread", "process"):
+            raise ValueError("PASSWORD_HASH_EXECUTOR must be 'thread' or 'process'")
+        return v
+    
+    @field_validator("LOGIN_THROTTLE_BACKEND")
+    @classmethod
+    def validate_login_throttle_backend(cls, v: str) -> str:
+        if v not in ("memory", "mongo"):
+            raise ValueError("LOGIN_THROTTLE_BACKEND must be 'memory' or 'mongo'")
+        return v
+    
+    @field_validator("BCRYPT_ROUNDS")
+    @classmethod
+    def validate_bcrypt_rounds(cls, v: int) -> int:
+        if not 4 <= v <= 31:
+            raise ValueError("BCRYPT_ROUNDS must be between 4 and 31")
+        return v
+    
+    @field_validator("ALGORITHM")
+    @classmethod
+    def validate_algorithm(cls, v: str) -> str:
+        if v not in ("HS256", "HS384", "HS512", "RS256", "RS384", "RS512", "ES256", "ES384", "ES512"):
+            raise ValueError("ALGORITHM must be one of HS256/HS384/HS512, RS256/RS384/RS512 or ES256/ES384/ES512")
+        return v
+    
+    @field_validator("JWT_CODEC")
+    @classmethod
+    def validate_jwt_codec(cls, v: str, info) -> str:
+        if v not in ("jose", "pyjwt", "hmac"):
+            raise ValueError("JWT_CODEC must be 'jose', 'pyjwt' or 'hmac'")
+        if v == "hmac" and not info.data.get("ALGORITHM", "").startswith("HS"):
+            raise ValueError("JWT_CODEC 'hmac' only supports HS256/HS384/HS512")
+        return v
+    
     @field_validator("SECRET_KEY")
     @classmethod
     def validate_secret_key(cls, v: str) -> str:
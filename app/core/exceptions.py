@@ -5,7 +5,8 @@ from fastapi.exceptions import RequestValidationError
 def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
-        content={"success": False, "message": exc.detail}
+        content={"success": False, "message": exc.detail},
+        headers=exc.headers
     )
 
 def validation_exception_handler(request: Request, exc: RequestValidationError):
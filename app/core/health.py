@@ -0,0 +1,90 @@
+import time
+import asyncio
+
+from app.db.database import db
+from app.core.config import settings
+from app.core.startup import startup
+from app.core.loop_monitor import loop_monitor
+from app.db.monitoring import pool_listener
+from app.core.security import hash_queue_depth
+
+HEALTHY = "healthy"
+OVERLOADED = "overloaded"
+UNHEALTHY = "unhealthy"
+
+async def probe_mongo() -> dict:
+    if db.client is None:
+        return {"status": UNHEALTHY, "error": "Not connected."}
+
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(db.client.admin.command("ping"), settings.HEALTH_MONGO_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return {"status": UNHEALTHY, "error": "Ping timed out."}
+    except Exception as e:
+        return {"status": UNHEALTHY, "error": type(e).__name__}
+
+    latency_ms = (time.perf_counter() - start) * 1000
+    status = OVERLOADED if latency_ms > settings.HEALTH_MAX_MONGO_LATENCY_MS else HEALTHY
+    return {"status": status, "latencyMs": round(latency_ms, 2)}
+
+def probe_mongo_pool() -> dict:
+    # The busiest server's pool; each server has its own MONGODB_MAX_POOL_SIZE connections
+    checked_out = max(pool_listener.checked_out.values(), default=0)
+    saturation = checked_out / settings.MONGODB_MAX_POOL_SIZE if settings.MONGODB_MAX_POOL_SIZE else 0.0
+    status = OVERLOADED if saturation >= settings.HEALTH_MAX_POOL_SATURATION else HEALTHY
+    return {"status": status, "checkedOut": checked_out, "maxSize": settings.MONGODB_MAX_POOL_SIZE, "saturation": round(saturation, 3)}
+
+def probe_hash_pool() -> dict:
+    depth = hash_queue_depth()
+    saturation = depth / settings.PASSWORD_HASH_MAX_QUEUE
+    status = OVERLOADED if saturation >= settings.HEALTH_MAX_HASH_QUEUE_SATURATION else HEALTHY
+    return {"status": status, "queueDepth": depth, "maxQueue": settings.PASSWORD_HASH_MAX_QUEUE, "saturation": round(saturation, 3)}
+
+async def probe_event_loop() -> dict:
+    # Time for a callback queued now to run, and the sampler's latest measurement
+    loop = asyncio.get_running_loop()
+    ran = loop.create_future()
+    start = time.perf_counter()
+    loop.call_soon(ran.set_result, None)
+    await ran
+    lag_ms = (time.perf_counter() - start) * 1000
+    sampled_lag_ms = loop_monitor.last_lag * 1000
+    status = OVERLOADED if max(lag_ms, sampled_lag_ms) > settings.HEALTH_MAX_LOOP_LAG_MS else HEALTHY
+    return {"status": status, "lagMs": round(lag_ms, 2), "sampledLagMs": round(sampled_lag_ms, 2)}
+
+class DeepHealthCheck:
+    """Runs every probe at most once per HEALTH_CACHE_SECONDS; concurrent callers share one run."""
+
+    def __init__(self):
+        self._result: dict | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _run(self) -> dict:
+        mongo, loop_lag = await asyncio.gather(probe_mongo(), probe_event_loop())
+        checks = {
+            "mongo": mongo,
+            "mongoPool": probe_mongo_pool(),
+            "hashPool": probe_hash_pool(),
+            "eventLoop": loop_lag,
+        }
+        statuses = {check["status"] for check in checks.values()}
+        if not startup.ready or UNHEALTHY in statuses:
+            status = UNHEALTHY
+        elif OVERLOADED in statuses:
+            status = OVERLOADED
+        else:
+            status = HEALTHY
+        return {"status": status, "version": settings.VERSION, "ready": startup.ready, "checks": checks}
+
+    async def check(self) -> dict:
+        if self._result and time.monotonic() - self._checked_at < settings.HEALTH_CACHE_SECONDS:
+            return self._result
+        async with self._lock:
+            if not self._result or time.monotonic() - self._checked_at >= settings.HEALTH_CACHE_SECONDS:
+                self._result = await self._run()
+                self._checked_at = time.monotonic()
+        return self._result
+
+deep_health = DeepHealthCheck()
@@ -0,0 +1,148 @@
+import hmac
+import json
+import time
+import base64
+import hashlib
+from datetime import datetime
+from typing import Any, Protocol
+from jose import jwt as jose_jwt
+from jose.exceptions import ExpiredSignatureError, JWTError
+
+# Every codec raises python-jose's exceptions so callers handle a single error type
+
+class JWTCodec(Protocol):
+    def encode(self, claims: dict, key: Any, algorithm: str, headers: dict | None = None) -> str: ...
+
+    def decode(self, token: str, key: Any, algorithms: list[str]) -> dict: ...
+
+    def get_unverified_header(self, token: str) -> dict: ...
+
+class JoseCodec:
+    def encode(self, claims: dict, key: Any, algorithm: str, headers: dict | None = None) -> str:
+        return jose_jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+
+    def decode(self, token: str, key: Any, algorithms: list[str]) -> dict:
+        return jose_jwt.decode(token, key, algorithms=algorithms)
+
+    def get_unverified_header(self, token: str) -> dict:
+        return jose_jwt.get_unverified_header(token)
+
+class PyJWTCodec:
+    def __init__(self):
+        import jwt as pyjwt
+        self._jwt = pyjwt
+
+    def encode(self, claims: dict, key: Any, algorithm: str, headers: dict | None = None) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+
+    def decode(self, token: str, key: Any, algorithms: list[str]) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._jwt.ExpiredSignatureError as e:
+            raise ExpiredSignatureError(str(e))
+        except self._jwt.PyJWTError as e:
+            raise JWTError(str(e))
+
+    def get_unverified_header(self, token: str) -> dict:
+        try:
+            return self._jwt.get_unverified_header(token)
+        except self._jwt.PyJWTError as e:
+            raise JWTError(str(e))
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def _b64decode(data: str | bytes) -> bytes:
+    if isinstance(data, str):
+        data = data.encode("ascii")
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+def _json_default(value: Any):
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if hasattr(value, "value"):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+class HmacCodec:
+    """Minimal HS256/384/512 codec that caches encoded headers and keyed HMAC state."""
+
+    def __init__(self):
+        self._headers: dict[tuple, bytes] = {}
+        self._signers: dict[tuple, Any] = {}
+
+    def _signer(self, key: str | bytes, algorithm: str):
+        if algorithm not in HMAC_DIGESTS:
+            raise JWTError(f"Algorithm {algorithm} is not supported by the hmac codec.")
+        cache_key = (key, algorithm)
+        signer = self._signers.get(cache_key)
+        if signer is None:
+            raw_key = key.encode() if isinstance(key, str) else key
+            signer = self._signers[cache_key] = hmac.new(raw_key, digestmod=HMAC_DIGESTS[algorithm])
+        return signer.copy()
+
+    def _header(self, algorithm: str, headers: dict | None) -> bytes:
+        cache_key = (algorithm, tuple(sorted((headers or {}).items())))
+        encoded = self._headers.get(cache_key)
+        if encoded is None:
+            # Sorted like python-jose, so both codecs produce identical tokens
+            header = {"alg": algorithm, "typ": "JWT", **(headers or {})}
+            encoded = self._headers[cache_key] = _b64encode(json.dumps(header, separators=(",", ":"), sort_keys=True).encode())
+        return encoded
+
+    def encode(self, claims: dict, key: Any, algorithm: str, headers: dict | None = None) -> str:
+        payload = _b64encode(json.dumps(claims, separators=(",", ":"), default=_json_default).encode())
+        signing_input = self._header(algorithm, headers) + b"." + payload
+        signer = self._signer(key, algorithm)
+        signer.update(signing_input)
+        return (signing_input + b"." + _b64encode(signer.digest())).decode("ascii")
+
+    def decode(self, token: str, key: Any, algorithms: list[str]) -> dict:
+        try:
+            signing_input, signature = token.encode("ascii").rsplit(b".", 1)
+            header_segment, payload_segment = signing_input.split(b".", 1)
+            header = json.loads(_b64decode(header_segment))
+            algorithm = header.get("alg")
+            if algorithm not in algorithms:
+                raise JWTError("The specified alg value is not allowed.")
+
+            signer = self._signer(key, algorithm)
+            signer.update(signing_input)
+            if not hmac.compare_digest(signer.digest(), _b64decode(signature)):
+                raise JWTError("Signature verification failed.")
+
+            claims = json.loads(_b64decode(payload_segment))
+        except JWTError:
+            raise
+        except (ValueError, TypeError, AttributeError):
+            raise JWTError("Invalid token.")
+
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload.")
+
+        now = time.time()
+        exp = claims.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise JWTError("Expiration Time claim (exp) must be an integer.")
+            if exp < now:
+                raise ExpiredSignatureError("Signature has expired.")
+        nbf = claims.get("nbf")
+        if nbf is not None and isinstance(nbf, (int, float)) and nbf > now:
+            raise JWTError("The token is not yet valid (nbf)")
+        return claims
+
+    def get_unverified_header(self, token: str) -> dict:
+        try:
+            return json.loads(_b64decode(token.split(".", 1)[0]))
+        except (ValueError, TypeError):
+            raise JWTError("Error decoding token headers.")
+
+CODECS = {"jose": JoseCodec, "pyjwt": PyJWTCodec, "hmac": HmacCodec}
+
+def get_codec(name: str) -> JWTCodec:
+    if name not in CODECS:
+        raise ValueError(f"Unknown JWT codec '{name}'. Expected one of: {', '.join(CODECS)}")
+    return CODECS[name]()
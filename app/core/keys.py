@@ -0,0 +1,76 @@
+from pathlib import Path
+from jose import jwk
+from jose.exceptions import JWTError
+from cryptography.hazmat.primitives import serialization
+
+ASYMMETRIC_PREFIXES = ("RS", "ES")
+
+class SigningKey:
+    def __init__(self, kid: str, private_pem: bytes | None, public_pem: bytes):
+        self.kid = kid
+        self.private_pem = private_pem
+        self.public_pem = public_pem
+
+    @classmethod
+    def from_pem(cls, kid: str, pem: bytes) -> "SigningKey":
+        try:
+            private_key = serialization.load_pem_private_key(pem, password=None)
+        except ValueError:
+            # Public-only keys stay valid for verification during rotation
+            public_key = serialization.load_pem_public_key(pem)
+            return cls(kid, None, public_key.public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo
+            ))
+
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        return cls(kid, pem, public_pem)
+
+class KeyRing:
+    def __init__(self, algorithm: str, secret_key: str, keys_dir: str | None = None, active_kid: str | None = None):
+        self.algorithm = algorithm
+        self.secret_key = secret_key
+        self.active_kid = active_kid
+        self.keys: dict[str, SigningKey] = {}
+
+        if not self.is_asymmetric:
+            return
+
+        if not keys_dir:
+            raise ValueError(f"JWT_KEYS_DIR is required for {algorithm} signing")
+        for path in sorted(Path(keys_dir).glob("*.pem")):
+            self.keys[path.stem] = SigningKey.from_pem(path.stem, path.read_bytes())
+
+        active = self.keys.get(active_kid or "")
+        if not active or not active.private_pem:
+            raise ValueError(f"JWT_ACTIVE_KID must name a private key in {keys_dir}")
+
+    @property
+    def is_asymmetric(self) -> bool:
+        return self.algorithm.startswith(ASYMMETRIC_PREFIXES)
+
+    def signing_key(self) -> tuple[str | bytes, dict | None]:
+        if not self.is_asymmetric:
+            return self.secret_key, None
+        key = self.keys[self.active_kid]
+        return key.private_pem, {"kid": key.kid}
+
+    def verification_key(self, kid: str | None) -> str | bytes:
+        if not self.is_asymmetric:
+            return self.secret_key
+
+        key = self.keys.get(kid)
+        if not key:
+            raise JWTError("Unknown signing key.")
+        return key.public_pem
+
+    def jwks(self) -> dict:
+        keys = []
+        for key in self.keys.values():
+            public_jwk = jwk.construct(key.public_pem, self.algorithm).to_dict()
+            public_jwk.update({"kid": key.kid, "use": "sig", "alg": self.algorithm})
+            keys.append(public_jwk)
+        return {"keys": keys}
@@ -0,0 +1,78 @@
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from contextlib import suppress
+
+from app.core.config import settings
+from app.core.metrics import EVENT_LOOP_LAG, EVENT_LOOP_BLOCKED
+
+logger = logging.getLogger(__name__)
+
+class LoopLagMonitor:
+    """Samples event-loop lag as the overshoot of a fixed sleep.
+
+    The optional watchdog thread notices when samples stop arriving (the loop is blocked) and
+    logs the loop thread's stack while it is still stuck, pointing at the blocking call.
+    """
+
+    def __init__(self, interval: float, watchdog_threshold: float | None = None):
+        self.interval = interval
+        self.watchdog_threshold = watchdog_threshold
+        self.last_lag = 0.0
+        self._heartbeat = time.monotonic()
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._loop_thread_id: int | None = None
+
+    async def _sample(self):
+        while True:
+            start = time.monotonic()
+            self._heartbeat = start
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, time.monotonic() - start - self.interval)
+            EVENT_LOOP_LAG.observe(self.last_lag)
+
+    def _watch(self):
+        reported = False
+        while not self._stopped.wait(self.watchdog_threshold / 4):
+            blocked_for = time.monotonic() - self._heartbeat - self.interval
+            if blocked_for < self.watchdog_threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+
+            # Report each stall once, with the stack that is holding the loop right now
+            reported = True
+            EVENT_LOOP_BLOCKED.inc()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<unavailable>"
+            logger.warning("Event loop blocked for %.0f ms:\n%s", blocked_for * 1000, stack)
+
+    def start(self):
+        if self._task:
+            return
+        self._task = asyncio.create_task(self._sample())
+        if self.watchdog_threshold:
+            self._loop_thread_id = threading.get_ident()
+            self._stopped.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self):
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+def _watchdog_threshold() -> float | None:
+    enabled = settings.DEBUG if settings.LOOP_WATCHDOG_ENABLED is None else settings.LOOP_WATCHDOG_ENABLED
+    return settings.LOOP_WATCHDOG_THRESHOLD_MS / 1000 if enabled else None
+
+loop_monitor = LoopLagMonitor(settings.LOOP_LAG_SAMPLE_SECONDS, _watchdog_threshold())
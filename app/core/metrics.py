@@ -0,0 +1,169 @@
+import os
+from prometheus_client import Gauge, Histogram, Counter, CollectorRegistry, REGISTRY, multiprocess, start_http_server
+
+# Gauges carry a multiprocess_mode for when PROMETHEUS_MULTIPROC_DIR is set (multi-worker servers):
+# "livesum" adds up per-worker values, "livemax" is for values every worker observes alike
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "auth_password_hash_queue_depth",
+    "Password hash/verify operations waiting for or running on the hash pool",
+    multiprocess_mode="livesum",
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "auth_password_hash_duration_seconds",
+    "Time spent hashing or verifying a password on the hash pool",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 1.0, 2.5, 5.0),
+)
+
+PASSWORD_HASH_REJECTED = Counter(
+    "auth_password_hash_rejected_total",
+    "Password hash/verify operations rejected by the hash pool",
+    ["operation", "reason"],
+)
+
+LOGIN_ATTEMPTS = Counter(
+    "auth_login_attempts_total",
+    "Login attempts by outcome (success, failure, throttled)",
+    ["result"],
+)
+
+TOKENS_ISSUED = Counter(
+    "auth_tokens_issued_total",
+    "Tokens issued by type",
+    ["type"],
+)
+
+LOGIN_THROTTLE_REJECTED = Counter(
+    "auth_login_throttle_rejected_total",
+    "Login attempts rejected by the throttle before password verification",
+    ["key"],
+)
+
+REVOCATION_FILTER_LOOKUPS = Counter(
+    "auth_revocation_filter_lookups_total",
+    "Revocation checks by filter outcome (negative answers skip the database)",
+    ["result"],
+)
+
+REVOCATION_LOOKUP_DURATION = Histogram(
+    "auth_revocation_lookup_duration_seconds",
+    "Time to answer a revocation check, by whether the filter or the database answered",
+    ["source"],
+    buckets=(0.00001, 0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+
+REVOCATION_FILTER_FALSE_POSITIVES = Counter(
+    "auth_revocation_filter_false_positives_total",
+    "Revocation filter hits that were not revoked in the database",
+)
+
+REVOCATION_FILTER_STALENESS = Gauge(
+    "auth_revocation_filter_staleness_seconds",
+    "Seconds since the revocation filter was last synchronized with the database",
+    multiprocess_mode="livemax",
+)
+
+REVOCATION_FILTER_SIZE = Gauge(
+    "auth_revocation_filter_entries",
+    "Revoked token identifiers currently held in the revocation filter",
+    multiprocess_mode="livemax",
+)
+
+USER_CACHE_LOOKUPS = Counter(
+    "auth_user_cache_lookups_total",
+    "User cache lookups by result",
+    ["result"],
+)
+
+TOKEN_CACHE_LOOKUPS = Counter(
+    "auth_token_cache_lookups_total",
+    "Verified-token payload cache lookups by result",
+    ["result"],
+)
+
+EMAIL_OUTBOX_PENDING = Gauge(
+    "auth_email_outbox_pending",
+    "Emails waiting in the outbox (pending or being sent)",
+    multiprocess_mode="livemax",
+)
+
+EMAIL_DELIVERIES = Counter(
+    "auth_email_deliveries_total",
+    "Outbox email delivery attempts by result",
+    ["kind", "result"],
+)
+
+EMAIL_RENDER_DURATION = Histogram(
+    "auth_email_render_duration_seconds",
+    "Time to render one email (all of its templates)",
+    ["templates"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+MONGO_POOL_CHECKOUT_WAIT = Histogram(
+    "auth_mongo_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the MongoDB pool",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+MONGO_POOL_CONNECTIONS = Gauge(
+    "auth_mongo_pool_connections",
+    "Open connections in the MongoDB pool",
+    ["address"],
+    multiprocess_mode="livesum",
+)
+
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "auth_mongo_pool_checked_out",
+    "MongoDB pool connections currently in use",
+    ["address"],
+    multiprocess_mode="livesum",
+)
+
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "auth_mongo_pool_checkout_failures_total",
+    "Failed MongoDB connection checkouts by reason",
+    ["reason"],
+)
+
+MONGO_COMMAND_DURATION = Histogram(
+    "auth_mongo_command_duration_seconds",
+    "MongoDB command latency by collection and command",
+    ["collection", "command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+MONGO_COMMAND_FAILURES = Counter(
+    "auth_mongo_command_failures_total",
+    "Failed MongoDB commands by collection and command",
+    ["collection", "command"],
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "auth_event_loop_lag_seconds",
+    "Delay of the event loop in running a scheduled wakeup",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+EVENT_LOOP_BLOCKED = Counter(
+    "auth_event_loop_blocked_total",
+    "Times the loop watchdog caught the event loop blocked past its threshold",
+)
+
+def metrics_registry() -> CollectorRegistry:
+    # Under multiple workers every process writes to PROMETHEUS_MULTIPROC_DIR; collect from all of them
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+def start_metrics_server(port: int) -> bool:
+    # With several workers only the first to bind serves; in multiprocess mode it reports for all of them
+    try:
+        start_http_server(port, registry=metrics_registry())
+    except OSError:
+        return False
+    return True
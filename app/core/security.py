@@ -1,9 +1,109 @@
+import time
+import asyncio
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_QUEUE_DEPTH, PASSWORD_HASH_DURATION, PASSWORD_HASH_REJECTED
+
+# Hashes with a different cost than BCRYPT_ROUNDS are flagged by needs_update
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
+
+_hash_executor: Executor | None = None
+_pending_hash_calls = 0
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def get_hash_executor() -> Executor:
+    global _hash_executor
+    if _hash_executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _hash_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        else:
+            # bcrypt releases the GIL, so threads hash in parallel as well
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash"
+            )
+    return _hash_executor
+
+def shutdown_hash_executor():
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True, cancel_futures=True)
+        _hash_executor = None
+
+def hash_queue_depth() -> int:
+    # Operations waiting for or running on the hash pool in this process
+    return _pending_hash_calls
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    return [hash_password(password) for password in passwords]
+
+async def _run_in_hash_pool(operation: str, func, *args, timeout: float | None = None):
+    global _pending_hash_calls
+    if _pending_hash_calls >= settings.PASSWORD_HASH_MAX_QUEUE:
+        PASSWORD_HASH_REJECTED.labels(operation, "queue_full").inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again later."
+        )
+
+    _pending_hash_calls += 1
+    PASSWORD_HASH_QUEUE_DEPTH.inc()
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        result = await asyncio.wait_for(
+            loop.run_in_executor(get_hash_executor(), func, *args),
+            timeout=timeout or settings.PASSWORD_HASH_TIMEOUT_SECONDS
+        )
+        PASSWORD_HASH_DURATION.labels(operation).observe(time.perf_counter() - start)
+        return result
+    except asyncio.TimeoutError:
+        PASSWORD_HASH_REJECTED.labels(operation, "timeout").inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again later."
+        )
+    finally:
+        _pending_hash_calls -= 1
+        PASSWORD_HASH_QUEUE_DEPTH.dec()
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hash_pool("hash", hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool("verify", verify_password, plain_password, hashed_password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await _run_in_hash_pool("verify", verify_and_update_password, plain_password, hashed_password)
+
+async def hash_passwords_async(passwords: list[str], parallelism: int, batch_size: int = 8) -> list[str]:
+    # Bulk hashing holds at most `parallelism` pool slots so interactive logins still get through
+    semaphore = asyncio.Semaphore(parallelism)
+
+    async def hash_batch(batch: list[str]) -> list[str]:
+        async with semaphore:
+            return await _run_in_hash_pool(
+                "hash_batch", hash_passwords, batch,
+                timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS * len(batch)
+            )
+
+    batches = [passwords[i:i + batch_size] for i in range(0, len(passwords), batch_size)]
+    results = await asyncio.gather(*(hash_batch(batch) for batch in batches))
+    return [hashed for batch in results for hashed in batch]
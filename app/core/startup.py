@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from contextlib import suppress
+
+from app.core.config import settings
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import start_metrics_server
+from app.core.security import shutdown_hash_executor
+from app.db.mongo_token_store import MongoRevokedTokenStore
+from app.db.database import db, connect_to_mongo, close_mongo_connection
+from app.services.email_service import start_email_worker, stop_email_worker
+from app.db.dependencies import get_revoked_token_store, get_email_outbox, init_indexes
+
+logger = logging.getLogger(__name__)
+
+STARTUP_RETRY_SECONDS = 5
+
+STARTING = "starting"
+READY = "ready"
+
+class Startup:
+    """Brings up the database and background workers, in the foreground or behind /ready."""
+
+    def __init__(self):
+        self.status = STARTING
+        self.indexes_ready = False
+        self._token_store: MongoRevokedTokenStore | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._connected = asyncio.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self.status == READY
+
+    async def _build_indexes(self):
+        try:
+            await init_indexes()
+            self.indexes_ready = True
+        except Exception:
+            logger.exception("Index verification failed")
+            raise
+
+    async def _build_indexes_until_ready(self):
+        # A single task for the process lifetime, independent of the startup retries
+        await self._connected.wait()
+        while not self.indexes_ready:
+            try:
+                await self._build_indexes()
+            except Exception:
+                await asyncio.sleep(STARTUP_RETRY_SECONDS)
+
+    async def _start(self):
+        # A retry reuses the client of an earlier attempt: the stores in app.db.dependencies are bound to it
+        if db.client is None:
+            await connect_to_mongo()
+        self._connected.set()
+
+        if not settings.STARTUP_INDEXES_IN_BACKGROUND:
+            await self._build_indexes()
+
+        # Revocation filter (shared with request handlers) and password reset email delivery
+        self._token_store = await get_revoked_token_store()
+        await self._token_store.start_filter_sync()
+        start_email_worker(await get_email_outbox())
+
+        self.status = READY
+
+    async def _start_until_ready(self):
+        while True:
+            try:
+                await self._start()
+                return
+            except Exception:
+                logger.exception("Startup failed, retrying in %s seconds", STARTUP_RETRY_SECONDS)
+                await asyncio.sleep(STARTUP_RETRY_SECONDS)
+
+    async def start(self):
+        if settings.METRICS_PORT:
+            start_metrics_server(settings.METRICS_PORT)
+        loop_monitor.start()
+        if settings.STARTUP_INDEXES_IN_BACKGROUND:
+            self._tasks.append(asyncio.create_task(self._build_indexes_until_ready()))
+        if settings.STARTUP_IN_BACKGROUND:
+            self._tasks.append(asyncio.create_task(self._start_until_ready()))
+        else:
+            await self._start()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+        await stop_email_worker()
+        if self._token_store:
+            await self._token_store.stop_filter_sync()
+        shutdown_hash_executor()
+        await close_mongo_connection()
+        await loop_monitor.stop()
+
+startup = Startup()
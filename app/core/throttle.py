@@ -0,0 +1,125 @@
+import math
+import time
+from fastapi import Request, HTTPException, status
+
+from app.db.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import LOGIN_THROTTLE_REJECTED
+from app.db.mongo_login_attempts import MongoLoginAttemptStore
+from app.db.dependencies import get_login_attempt_store
+
+IP = "ip"
+EMAIL = "email"
+
+class SlidingWindowLimiter:
+    """Sliding-window counter: the previous fixed window is weighted by how much of it still overlaps."""
+
+    def __init__(self, limit: int, window_seconds: int, max_keys: int):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        # key -> [window, previous count, current count]; idle keys age out after two windows
+        self._counters = TTLCache(max_keys, 2 * window_seconds)
+
+    def window(self, now: float) -> int:
+        return int(now // self.window_seconds)
+
+    def estimate(self, previous: int, current: int, now: float) -> float:
+        elapsed = (now % self.window_seconds) / self.window_seconds
+        return previous * (1 - elapsed) + current
+
+    def retry_after(self, previous: int, current: int, now: float) -> int:
+        # Seconds until the weighted previous window has decayed enough to admit one more attempt
+        elapsed = now % self.window_seconds
+        if current >= self.limit or previous == 0:
+            return math.ceil(self.window_seconds - elapsed) or 1
+        decay = (previous + current - self.limit + 1) / previous * self.window_seconds
+        return max(1, math.ceil(decay - elapsed))
+
+    def hit(self, key: str, now: float) -> tuple[int, int]:
+        window = self.window(now)
+        counter = self._counters.get(key)
+        if counter is None or counter[0] < window - 1:
+            counter = [window, 0, 0]
+        elif counter[0] == window - 1:
+            counter = [window, counter[2], 0]
+        counter[2] += 1
+        self._counters.set(key, counter)
+        return counter[1], counter[2]
+
+    def clear(self, key: str):
+        self._counters.pop(key)
+
+class LoginThrottle:
+    """Limits login attempts per client IP and per email before any password is verified.
+
+    The in-memory counters only see this worker's attempts, so a local rejection is always
+    correct and skips the database; with a shared store, admitted attempts are counted there too.
+    """
+
+    def __init__(self, store: MongoLoginAttemptStore | None = None):
+        window = settings.LOGIN_THROTTLE_WINDOW_SECONDS
+        self.store = store
+        self.limiters = {
+            IP: SlidingWindowLimiter(settings.LOGIN_THROTTLE_IP_LIMIT, window, settings.LOGIN_THROTTLE_MAX_KEYS),
+            EMAIL: SlidingWindowLimiter(settings.LOGIN_THROTTLE_EMAIL_LIMIT, window, settings.LOGIN_THROTTLE_MAX_KEYS),
+        }
+
+    async def _retry_after(self, kind: str, key: str, now: float) -> int | None:
+        limiter = self.limiters[kind]
+        previous, current = limiter.hit(key, now)
+        if limiter.estimate(previous, current, now) <= limiter.limit:
+            if self.store is None:
+                return None
+            try:
+                previous, current = await self.store.hit(
+                    f"{kind}:{key}", limiter.window(now), limiter.window_seconds
+                )
+            except Exception:
+                return None  # The shared store is best effort; local limits still apply
+            if limiter.estimate(previous, current, now) <= limiter.limit:
+                return None
+        return limiter.retry_after(previous, current, now)
+
+    async def check(self, client_ip: str | None, email: str):
+        now = time.time()
+        for kind, key in ((IP, client_ip), (EMAIL, email)):
+            if not key:
+                continue
+            retry_after = await self._retry_after(kind, key, now)
+            if retry_after is not None:
+                LOGIN_THROTTLE_REJECTED.labels(kind).inc()
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many login attempts, please try again later.",
+                    headers={"Retry-After": str(retry_after)}
+                )
+
+    async def succeeded(self, email: str):
+        # A successful login clears the account's counter so earlier typos don't lock it out
+        limiter = self.limiters[EMAIL]
+        limiter.clear(email)
+        if self.store is not None:
+            try:
+                await self.store.clear(f"{EMAIL}:{email}", limiter.window(time.time()))
+            except Exception:
+                pass
+
+def client_ip(request: Request) -> str | None:
+    if settings.LOGIN_THROTTLE_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            # The right-most entry is the one appended by our own proxy
+            return forwarded.rsplit(",", 1)[-1].strip()
+    return request.client.host if request.client else None
+
+_login_throttle: LoginThrottle | None = None
+
+async def get_login_throttle() -> LoginThrottle | None:
+    global _login_throttle
+    if not settings.LOGIN_THROTTLE_ENABLED:
+        return None
+    if not _login_throttle:
+        store = await get_login_attempt_store() if settings.LOGIN_THROTTLE_BACKEND == "mongo" else None
+        # Re-checked after the await so concurrent first requests share one throttle
+        _login_throttle = _login_throttle or LoginThrottle(store)
+    return _login_throttle
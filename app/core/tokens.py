@@ -1,50 +1,80 @@
+import time
+import hashlib
 from enum import Enum
-from jose import jwt
 from uuid import uuid4
 from fastapi import HTTPException
 from datetime import datetime, timedelta, timezone
 from jose.exceptions import ExpiredSignatureError, JWTError
 
+from app.core.keys import KeyRing
+from app.db.cache import TTLCache
 from app.core.config import settings
+from app.core.jwt_codec import get_codec
+from app.core.metrics import TOKEN_CACHE_LOOKUPS, TOKENS_ISSUED
 from app.db.mongo_token_store import MongoRevokedTokenStore
+from app.db.mongo_refresh_token_store import MongoRefreshTokenStore, REUSED, UNKNOWN
 
 class TokenType(str, Enum):
     ACCESS = "access"
     RESET = "reset"
+    REFRESH = "refresh"
 
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 
+keyring = KeyRing(ALGORITHM, SECRET_KEY, settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID)
+codec = get_codec(settings.JWT_CODEC)
+
+# Verified payloads keyed by token digest; entries expire with the token itself
+token_cache = TTLCache(settings.TOKEN_CACHE_MAX_SIZE, 0)
+
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 RESET_TOKEN_EXPIRE_MINUTES = settings.RESET_TOKEN_EXPIRE_MINUTES
+REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire, "type": TokenType.ACCESS, "jti": str(uuid4()), "iat": datetime.now(timezone.utc)})
     
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    TOKENS_ISSUED.labels(TokenType.ACCESS.value).inc()
+    key, headers = keyring.signing_key()
+    return codec.encode(to_encode, key, algorithm=ALGORITHM, headers=headers)
 
 def create_reset_token(user_id: str):
     expire = datetime.now(timezone.utc) + timedelta(minutes=RESET_TOKEN_EXPIRE_MINUTES)
-    to_encode = {"sub": user_id, "exp": expire, "type": TokenType.RESET}
+    to_encode = {"sub": user_id, "exp": expire, "type": TokenType.RESET, "jti": str(uuid4()), "iat": datetime.now(timezone.utc)}
     
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    TOKENS_ISSUED.labels(TokenType.RESET.value).inc()
+    key, headers = keyring.signing_key()
+    return codec.encode(to_encode, key, algorithm=ALGORITHM, headers=headers)
 
-async def verify_token(token: str, expected_type: TokenType, store: MongoRevokedTokenStore) -> dict:
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+async def create_refresh_token(user_id: str, store: MongoRefreshTokenStore, family: str | None = None) -> str:
+    jti = str(uuid4())
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode = {"sub": user_id, "exp": expire, "type": TokenType.REFRESH, "jti": jti, "fam": family or jti, "iat": now}
 
-        if await store.is_revoked(token):
-            raise HTTPException(status_code=401, detail="Token has been revoked.")
+    await store.issue(jti, user_id, family or jti, expire)
+    TOKENS_ISSUED.labels(TokenType.REFRESH.value).inc()
+    key, headers = keyring.signing_key()
+    return codec.encode(to_encode, key, algorithm=ALGORITHM, headers=headers)
 
-        if not payload.get("sub"):
-            raise HTTPException(status_code=401, detail="Invalid token payload.")
+def _verification_key(token: str) -> str | bytes:
+    if not keyring.is_asymmetric:
+        return keyring.secret_key
+    return keyring.verification_key(codec.get_unverified_header(token).get("kid"))
 
-        if payload.get("type") != expected_type:
-            raise HTTPException(status_code=403, detail="Invalid token type.")
+def _decode_token(token: str, expected_type: TokenType) -> dict:
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = token_cache.get(cache_key)
+    if cached is not None:
+        TOKEN_CACHE_LOOKUPS.labels("hit").inc()
+        return cached.copy()
+    TOKEN_CACHE_LOOKUPS.labels("miss").inc()
 
-        return payload
+    try:
+        payload = codec.decode(token, _verification_key(token), algorithms=[ALGORITHM])
 
     except ExpiredSignatureError:
         raise HTTPException(status_code=401, detail=f"{expected_type.value.capitalize()} token has expired.")
@@ -52,14 +82,96 @@ async def verify_token(token: str, expected_type: TokenType, store: MongoRevoked
     except JWTError:
         raise HTTPException(status_code=401, detail=f"Invalid {expected_type.value.capitalize()} token.")
 
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and exp > time.time():
+        token_cache.set(cache_key, payload, exp - time.time())
+    return payload.copy()
+
+def _validate_claims(payload: dict, expected_type: TokenType):
+    if not payload.get("sub"):
+        raise HTTPException(status_code=401, detail="Invalid token payload.")
+
+    if payload.get("type") != expected_type:
+        raise HTTPException(status_code=403, detail="Invalid token type.")
+
+def _checks_revocation(expected_type: TokenType) -> bool:
+    # Without the check, a leaked access token stays usable until exp, so keep them short-lived
+    return expected_type != TokenType.ACCESS or settings.ACCESS_TOKEN_REVOCATION_CHECK
+
+async def verify_token(token: str, expected_type: TokenType, store: MongoRevokedTokenStore) -> dict:
+    payload = _decode_token(token, expected_type)
+
+    if _checks_revocation(expected_type) and await store.is_revoked(payload.get("jti") or token, legacy_token=token):
+        raise HTTPException(status_code=401, detail="Token has been revoked.")
+
+    _validate_claims(payload, expected_type)
+    return payload
+
+async def verify_tokens(tokens: list[str], expected_type: TokenType, store: MongoRevokedTokenStore) -> list[dict | HTTPException]:
+    results: list[dict | HTTPException] = []
+    for token in tokens:
+        try:
+            results.append(_decode_token(token, expected_type))
+        except HTTPException as e:
+            results.append(e)
+
+    # Resolve every revocation with a single query
+    revoked = set()
+    if _checks_revocation(expected_type):
+        revoked = await store.get_revoked([
+            (result.get("jti") or token, token)
+            for token, result in zip(tokens, results) if isinstance(result, dict)
+        ])
+
+    for i, (token, result) in enumerate(zip(tokens, results)):
+        if not isinstance(result, dict):
+            continue
+        if (result.get("jti") or token) in revoked:
+            results[i] = HTTPException(status_code=401, detail="Token has been revoked.")
+            continue
+        try:
+            _validate_claims(result, expected_type)
+        except HTTPException as e:
+            results[i] = e
+
+    return results
+
 async def revoke_token(token: str, store: MongoRevokedTokenStore) -> bool:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = codec.decode(token, _verification_key(token), algorithms=[ALGORITHM])
         exp_timestamp = payload.get("exp")
         if exp_timestamp:
             expires_at = datetime.fromtimestamp(exp_timestamp, tz=timezone.utc)
-            await store.revoke(token, expires_at)
+            await store.revoke(payload.get("jti") or token, expires_at)
             return True
     except JWTError:
         pass
     return False
+
+async def rotate_refresh_token(token: str, store: MongoRefreshTokenStore) -> tuple[dict, str]:
+    payload = _decode_token(token, TokenType.REFRESH)
+    _validate_claims(payload, TokenType.REFRESH)
+
+    jti, family = payload.get("jti"), payload.get("fam")
+    if not jti or not family:
+        raise HTTPException(status_code=401, detail="Invalid token payload.")
+
+    result = await store.consume(jti)
+    if result == REUSED:
+        # A rotated-out token came back: assume it was stolen and end the whole session
+        await store.revoke_family(family)
+        raise HTTPException(status_code=401, detail="Refresh token reuse detected.")
+    if result == UNKNOWN:
+        raise HTTPException(status_code=401, detail="Token has been revoked.")
+
+    return payload, await create_refresh_token(payload["sub"], store, family)
+
+async def revoke_refresh_token(token: str, store: MongoRefreshTokenStore) -> bool:
+    try:
+        payload = codec.decode(token, _verification_key(token), algorithms=[ALGORITHM])
+    except JWTError:
+        return False
+    if payload.get("type") != TokenType.REFRESH or not payload.get("fam"):
+        return False
+    await store.revoke_family(payload["fam"])
+    return True
@@ -1,6 +1,10 @@
+import logging
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.errors import ServerSelectionTimeoutError
 from app.core.config import settings
+from app.db.monitoring import pool_listener, command_listener
+
+logger = logging.getLogger(__name__)
 
 class Database:
     client: AsyncIOMotorClient = None
@@ -12,16 +16,39 @@ async def get_database() -> AsyncIOMotorClient:
         return db.client[settings.TEST_DB_NAME]
     return db.client[settings.MONGODB_DB_NAME]
 
-async def connect_to_mongo():
+def client_options() -> dict:
+    options = {
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "event_listeners": [pool_listener, command_listener],
+    }
+    if settings.MONGODB_MAX_IDLE_TIME_MS is not None:
+        options["maxIdleTimeMS"] = settings.MONGODB_MAX_IDLE_TIME_MS
+    if settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options["waitQueueTimeoutMS"] = settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS
+    if settings.MONGODB_COMPRESSORS:
+        options["compressors"] = settings.MONGODB_COMPRESSORS
+    return options
+
+async def _connect(url: str) -> AsyncIOMotorClient:
+    client = AsyncIOMotorClient(url, **client_options())
     try:
-        client = AsyncIOMotorClient(settings.MONGODB_URL, serverSelectionTimeoutMS=10000)
         await client.server_info()
-        db.client = client
+    except Exception:
+        client.close()
+        raise
+    return client
+
+async def connect_to_mongo():
+    try:
+        db.client = await _connect(settings.MONGODB_URL)
     except ServerSelectionTimeoutError:
-        fallback_client = AsyncIOMotorClient("mongodb://localhost:27017", serverSelectionTimeoutMS=10000)
-        await fallback_client.server_info()
-        db.client = fallback_client
+        if not settings.MONGODB_FALLBACK_URL:
+            raise
+        logger.warning("MongoDB at MONGODB_URL is unreachable, falling back to MONGODB_FALLBACK_URL")
+        db.client = await _connect(settings.MONGODB_FALLBACK_URL)
 
 async def close_mongo_connection():
     if db.client:
-        db.client.close()
\ No newline at end of file
+        db.client.close()
@@ -1,22 +1,58 @@
+import asyncio
+from fastapi import HTTPException, status
+
 from app.db.mongo import MongoUserDB
-from app.db.database import get_database
+from app.core.config import settings
+from app.db.database import db, get_database
+from app.db.mongo_email_outbox import MongoEmailOutbox
 from app.db.mongo_token_store import MongoRevokedTokenStore
+from app.db.mongo_login_attempts import MongoLoginAttemptStore
+from app.db.mongo_refresh_token_store import MongoRefreshTokenStore
+
+# One instance per store class; indexes are verified once at startup (see init_indexes)
+_instances: dict[type, object] = {}
+_instances_lock = asyncio.Lock()
+
+async def _instance(store_cls: type):
+    instance = _instances.get(store_cls)
+    if instance is not None:
+        return instance
+
+    if db.client is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service is starting, please try again later."
+        )
 
-_user_db_instance: MongoUserDB | None = None
-_revoked_token_store: MongoRevokedTokenStore | None = None
+    async with _instances_lock:
+        instance = _instances.get(store_cls)
+        if instance is None:
+            instance = store_cls(await get_database())
+            _instances[store_cls] = instance
+    return instance
 
 async def get_user_db() -> MongoUserDB:
-    global _user_db_instance
-    if not _user_db_instance:
-        db = await get_database()
-        _user_db_instance = MongoUserDB(db)
-        await _user_db_instance.init_indexes()
-    return _user_db_instance
+    return await _instance(MongoUserDB)
 
 async def get_revoked_token_store() -> MongoRevokedTokenStore:
-    global _revoked_token_store
-    if not _revoked_token_store:
-        db = await get_database()
-        _revoked_token_store = MongoRevokedTokenStore(db)
-        await _revoked_token_store.init_indexes()
-    return _revoked_token_store
+    return await _instance(MongoRevokedTokenStore)
+
+async def get_email_outbox() -> MongoEmailOutbox:
+    return await _instance(MongoEmailOutbox)
+
+async def get_login_attempt_store() -> MongoLoginAttemptStore:
+    return await _instance(MongoLoginAttemptStore)
+
+async def get_refresh_token_store() -> MongoRefreshTokenStore:
+    return await _instance(MongoRefreshTokenStore)
+
+async def init_indexes():
+    stores = [
+        await get_user_db(),
+        await get_revoked_token_store(),
+        await get_email_outbox(),
+        await get_refresh_token_store(),
+    ]
+    if settings.LOGIN_THROTTLE_BACKEND == "mongo":
+        stores.append(await get_login_attempt_store())
+    await asyncio.gather(*(store.init_indexes() for store in stores))
@@ -0,0 +1,54 @@
+from typing import Optional
+from contextvars import ContextVar
+
+from app.db.projections import covers, merge
+
+class IdentityMap:
+    def __init__(self):
+        self._by_id: dict[str, tuple[str, dict]] = {}
+        self._by_email: dict[str, str] = {}
+
+    def get_by_id(self, user_id: str, profile: str) -> Optional[dict]:
+        entry = self._by_id.get(user_id)
+        if entry and covers(entry[0], profile):
+            return entry[1]
+        return None
+
+    def get_by_email(self, email: str, profile: str) -> Optional[dict]:
+        user_id = self._by_email.get(email)
+        return self.get_by_id(user_id, profile) if user_id else None
+
+    def add(self, user: dict, profile: str, replace: bool = False):
+        current = self._by_id.get(user["id"])
+        self.remove(user["id"])
+        profile, user = merge(None if replace else current, profile, user)
+        self._by_id[user["id"]] = (profile, user)
+        if user.get("email"):
+            self._by_email[user["email"]] = user["id"]
+
+    def remove(self, user_id: str):
+        entry = self._by_id.pop(user_id, None)
+        if entry:
+            self._by_email.pop(entry[1].get("email"), None)
+
+_identity_map: ContextVar[Optional[IdentityMap]] = ContextVar("identity_map", default=None)
+
+def current_identity_map() -> Optional[IdentityMap]:
+    return _identity_map.get()
+
+class IdentityMapMiddleware:
+    """Gives every HTTP request its own identity map of loaded users."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _identity_map.set(IdentityMap())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _identity_map.reset(token)
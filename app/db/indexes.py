@@ -0,0 +1,37 @@
+import logging
+from pymongo import IndexModel
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+logger = logging.getLogger(__name__)
+
+# Index options that change behavior; a mismatch needs a manual drop and rebuild
+CHECKED_OPTIONS = ("unique", "expireAfterSeconds")
+
+def _key(keys) -> tuple:
+    # Servers may report numeric directions as doubles (1.0)
+    return tuple(
+        (field, int(direction) if isinstance(direction, float) else direction)
+        for field, direction in keys.items()
+    )
+
+async def ensure_indexes(collection: AsyncIOMotorCollection, indexes: list[IndexModel]) -> list[str]:
+    """Creates only the indexes missing from the collection, found with a single list_indexes."""
+    existing = {_key(index["key"]): index async for index in collection.list_indexes()}
+
+    missing = []
+    for model in indexes:
+        spec = model.document
+        current = existing.get(_key(spec["key"]))
+        if current is None:
+            missing.append(model)
+            continue
+        for option in CHECKED_OPTIONS:
+            if current.get(option) != spec.get(option):
+                logger.warning(
+                    "Index %s on %s has %s=%r, expected %r",
+                    current["name"], collection.name, option, current.get(option), spec.get(option)
+                )
+
+    if not missing:
+        return []
+    return await collection.create_indexes(missing)
@@ -1,39 +1,119 @@
 from uuid import uuid4
-from typing import Optional, List
-from pymongo import ReturnDocument
+from typing import Optional, List, AsyncIterator
+from pymongo import ReturnDocument, ASCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError, BulkWriteError
 from datetime import datetime, timezone
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.db.cache import TTLCache
+from app.db.indexes import ensure_indexes
+from app.core.config import settings
+from app.core.metrics import USER_CACHE_LOOKUPS
+from app.db.identity_map import current_identity_map
+from app.db.projections import PROJECTIONS, FULL, PUBLIC, EXISTENCE, covers, merge, without_secrets
+
+USER_INDEXES = [
+    IndexModel("email", unique=True),
+    IndexModel("id", unique=True),
+    # Keyset pagination / export order, optionally filtered by type and locality
+    IndexModel([("createdAt", ASCENDING), ("id", ASCENDING)]),
+    IndexModel([("userType", ASCENDING), ("locality", ASCENDING), ("createdAt", ASCENDING), ("id", ASCENDING)]),
+]
+
 class MongoUserDB:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.collection = db["users"]
+        self.cache = TTLCache(
+            settings.USER_CACHE_MAX_SIZE if settings.USER_CACHE_ENABLED else 0,
+            settings.USER_CACHE_TTL_SECONDS
+        )
 
     async def init_indexes(self):
-        await self.collection.create_index("email", unique=True)
-        await self.collection.create_index("id", unique=True)
+        await ensure_indexes(self.collection, USER_INDEXES)
 
     async def reset(self):
         await self.collection.delete_many({})
-
-    async def get_by_id(self, user_id: str) -> Optional[dict]:
+        self.cache.clear()
+
+    def _cached(self, user_id: str, profile: str) -> Optional[dict]:
+        entry = self.cache.get(user_id)
+        if entry is not None and covers(entry[0], profile):
+            USER_CACHE_LOOKUPS.labels("hit").inc()
+            identity_map = current_identity_map()
+            if identity_map is not None:
+                identity_map.add(entry[1], entry[0])
+            return entry[1]
+        USER_CACHE_LOOKUPS.labels("miss").inc()
+        return None
+
+    def _remember(self, user: Optional[dict], profile: str, replace: bool = False):
+        if user:
+            # Password hashes are never shared across requests: another worker may change them at any
+            # time, so FULL/CREDENTIALS reads always go to MongoDB
+            cached_profile, cached_user = without_secrets(profile, user)
+            current = None if replace else self.cache.get(user["id"])
+            self.cache.set(user["id"], merge(current, cached_profile, cached_user))
+            identity_map = current_identity_map()
+            if identity_map is not None:
+                identity_map.add(user, profile, replace=replace)
+
+    def _forget(self, user_id: str):
+        self.cache.pop(user_id)
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            identity_map.remove(user_id)
+
+    async def get_by_id(self, user_id: str, profile: str = FULL) -> Optional[dict]:
         if not user_id:
             return None
-        return await self.collection.find_one({"id": user_id})
 
-    async def get_by_email(self, email: str) -> Optional[dict]:
+        identity_map = current_identity_map()
+        if identity_map is not None and (user := identity_map.get_by_id(user_id, profile)):
+            return user.copy()
+
+        cached = self._cached(user_id, profile)
+        if cached is not None:
+            return cached.copy()
+
+        user = await self.collection.find_one({"id": user_id}, PROJECTIONS[profile])
+        self._remember(user, profile)
+        return user.copy() if user else None
+
+    async def get_by_ids(self, user_ids: list[str], profile: str = FULL) -> dict[str, dict]:
+        users: dict[str, dict] = {}
+        missing: list[str] = []
+        for user_id in set(filter(None, user_ids)):
+            cached = self._cached(user_id, profile)
+            if cached is not None:
+                users[user_id] = cached.copy()
+            else:
+                missing.append(user_id)
+
+        if missing:
+            async for user in self.collection.find({"id": {"$in": missing}}, PROJECTIONS[profile]):
+                self._remember(user, profile)
+                users[user["id"]] = user.copy()
+
+        return users
+
+    async def get_by_email(self, email: str, profile: str = FULL) -> Optional[dict]:
         if not email:
             return None
-        return await self.collection.find_one({"email": email.strip().lower()})
+        email = email.strip().lower()
+
+        identity_map = current_identity_map()
+        if identity_map is not None and (user := identity_map.get_by_email(email, profile)):
+            return user.copy()
+
+        user = await self.collection.find_one({"email": email}, PROJECTIONS[profile])
+        self._remember(user, profile)
+        return user.copy() if user else None
 
     async def create(self, user_data: dict) -> dict:
         if not user_data or "email" not in user_data:
             raise ValueError("User data must contain email.")
 
         email = user_data["email"].strip().lower()
-        existing = await self.get_by_email(email)
-        if existing:
-            raise ValueError("Email already exists.")
-
         user_id = str(uuid4())
         now = datetime.now(timezone.utc)
 
@@ -45,14 +125,80 @@ class MongoUserDB:
             "updatedAt": now
         })
 
-        await self.collection.insert_one(user_data_copy)
-        return user_data_copy
+        # The unique email index enforces uniqueness without a pre-query
+        try:
+            await self.collection.insert_one(user_data_copy)
+        except DuplicateKeyError:
+            raise ValueError("Email already exists.")
 
-    async def get_all(self) -> List[dict]:
-        cursor = self.collection.find({})
-        return await cursor.to_list(length=None)
+        user_data_copy.pop("_id", None)
+        self._remember(user_data_copy.copy(), FULL, replace=True)
+        return user_data_copy
 
-    async def update(self, user_id: str, updates: dict) -> Optional[dict]:
+    async def create_many(self, users: List[dict]) -> tuple[List[dict], List[Optional[str]]]:
+        # Unordered insert: one bad row does not stop the rest; errors are reported per index
+        now = datetime.now(timezone.utc)
+        docs = [{
+            **user,
+            "id": str(uuid4()),
+            "email": user["email"].strip().lower(),
+            "createdAt": now,
+            "updatedAt": now
+        } for user in users]
+        errors: List[Optional[str]] = [None] * len(docs)
+        if not docs:
+            return docs, errors
+
+        try:
+            await self.collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                errors[error["index"]] = "Email already exists." if error.get("code") == 11000 else error.get("errmsg", "Insert failed.")
+
+        for doc in docs:
+            doc.pop("_id", None)
+        return docs, errors
+
+    @staticmethod
+    def _listing_filter(user_type: Optional[str], locality: Optional[str]) -> dict:
+        query = {}
+        if user_type:
+            query["userType"] = user_type
+        if locality:
+            query["locality"] = locality
+        return query
+
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[tuple[datetime, str]] = None,
+        user_type: Optional[str] = None,
+        locality: Optional[str] = None,
+    ) -> List[dict]:
+        query = self._listing_filter(user_type, locality)
+        if after:
+            created_at, user_id = after
+            query["$or"] = [
+                {"createdAt": {"$gt": created_at}},
+                {"createdAt": created_at, "id": {"$gt": user_id}}
+            ]
+
+        cursor = self.collection.find(query, PROJECTIONS[PUBLIC])
+        cursor = cursor.sort([("createdAt", ASCENDING), ("id", ASCENDING)]).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    async def iter_users(
+        self,
+        user_type: Optional[str] = None,
+        locality: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[dict]:
+        cursor = self.collection.find(self._listing_filter(user_type, locality), PROJECTIONS[PUBLIC])
+        cursor = cursor.sort([("createdAt", ASCENDING), ("id", ASCENDING)]).batch_size(batch_size)
+        async for user in cursor:
+            yield user
+
+    async def update(self, user_id: str, updates: dict, profile: str = FULL) -> Optional[dict]:
         if not user_id or not updates:
             return None
 
@@ -60,19 +206,27 @@ class MongoUserDB:
         if "email" in updates:
             updates["email"] = updates["email"].strip().lower()
 
-            existing = await self.get_by_email(updates["email"])
-            if existing and existing["id"] != user_id:
-                raise ValueError("Email already exists.")
-
         updates["updatedAt"] = datetime.now(timezone.utc)
 
-        return await self.collection.find_one_and_update(
-            {"id": user_id},
-            {"$set": updates},
-            return_document=ReturnDocument.AFTER
-        )
+        try:
+            updated = await self.collection.find_one_and_update(
+                {"id": user_id},
+                {"$set": updates},
+                projection=PROJECTIONS[profile],
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            raise ValueError("Email already exists.")
+
+        # Write-through so password/profile changes are visible on this worker immediately
+        if updated:
+            self._remember(updated, profile, replace=True)
+            return updated.copy()
+        self._forget(user_id)
+        return None
 
     async def delete(self, user_id: str) -> Optional[dict]:
         if not user_id:
             return None
-        return await self.collection.find_one_and_delete({"id": user_id})
+        self._forget(user_id)
+        return await self.collection.find_one_and_delete({"id": user_id}, projection=PROJECTIONS[EXISTENCE])
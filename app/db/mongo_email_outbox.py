@@ -0,0 +1,68 @@
+from typing import Optional
+from pymongo import ASCENDING, ReturnDocument, IndexModel
+from datetime import datetime, timedelta, timezone
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.db.indexes import ensure_indexes
+
+EMAIL_OUTBOX_COLLECTION = "email_outbox"
+
+PENDING = "pending"
+SENDING = "sending"
+FAILED = "failed"
+
+EMAIL_OUTBOX_INDEXES = [
+    IndexModel([("status", ASCENDING), ("nextAttemptAt", ASCENDING)]),
+]
+
+class MongoEmailOutbox:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection = db[EMAIL_OUTBOX_COLLECTION]
+
+    async def init_indexes(self):
+        await ensure_indexes(self.collection, EMAIL_OUTBOX_INDEXES)
+
+    async def enqueue(self, kind: str, to_email: str, data: dict) -> None:
+        now = datetime.now(timezone.utc)
+        await self.collection.insert_one({
+            "kind": kind,
+            "to": to_email,
+            "data": data,
+            "status": PENDING,
+            "attempts": 0,
+            "createdAt": now,
+            "nextAttemptAt": now
+        })
+
+    async def claim(self, lease: timedelta) -> Optional[dict]:
+        # Items whose lease expired (worker crashed mid-send) are picked up again
+        now = datetime.now(timezone.utc)
+        return await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": PENDING, "nextAttemptAt": {"$lte": now}},
+                {"status": SENDING, "leaseUntil": {"$lte": now}}
+            ]},
+            {"$set": {"status": SENDING, "leaseUntil": now + lease}, "$inc": {"attempts": 1}},
+            sort=[("nextAttemptAt", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def mark_sent(self, item_id) -> None:
+        await self.collection.delete_one({"_id": item_id})
+
+    async def mark_failed(self, item: dict, retry_in: timedelta | None, error: str) -> None:
+        if retry_in is None:
+            update = {"status": FAILED, "lastError": error}
+        else:
+            update = {
+                "status": PENDING,
+                "nextAttemptAt": datetime.now(timezone.utc) + retry_in,
+                "lastError": error
+            }
+        await self.collection.update_one({"_id": item["_id"]}, {"$set": update, "$unset": {"leaseUntil": ""}})
+
+    async def pending_count(self) -> int:
+        return await self.collection.count_documents({"status": {"$in": [PENDING, SENDING]}})
+
+    async def reset(self):
+        await self.collection.delete_many({})
@@ -0,0 +1,38 @@
+from pymongo import ASCENDING, ReturnDocument, IndexModel
+from datetime import datetime, timezone
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.db.indexes import ensure_indexes
+
+LOGIN_ATTEMPTS_COLLECTION = "login_attempts"
+
+LOGIN_ATTEMPTS_INDEXES = [
+    IndexModel([("expiresAt", ASCENDING)], expireAfterSeconds=0),
+]
+
+class MongoLoginAttemptStore:
+    """Per-window login attempt counters shared by every worker."""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection = db[LOGIN_ATTEMPTS_COLLECTION]
+
+    async def init_indexes(self):
+        await ensure_indexes(self.collection, LOGIN_ATTEMPTS_INDEXES)
+
+    async def hit(self, key: str, window: int, window_seconds: int) -> tuple[int, int]:
+        # Returns (previous window count, current window count including this hit)
+        expires_at = datetime.fromtimestamp((window + 2) * window_seconds, timezone.utc)
+        current = await self.collection.find_one_and_update(
+            {"_id": f"{key}:{window}"},
+            {"$inc": {"count": 1}, "$setOnInsert": {"expiresAt": expires_at}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        previous = await self.collection.find_one({"_id": f"{key}:{window - 1}"}, {"count": 1})
+        return (previous["count"] if previous else 0), current["count"]
+
+    async def clear(self, key: str, window: int):
+        await self.collection.delete_many({"_id": {"$in": [f"{key}:{window - 1}", f"{key}:{window}"]}})
+
+    async def reset(self):
+        await self.collection.delete_many({})
@@ -0,0 +1,66 @@
+from uuid import UUID
+from bson import Binary
+from pymongo import ASCENDING, IndexModel
+from datetime import datetime, timezone
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.db.indexes import ensure_indexes
+
+REFRESH_TOKENS_COLLECTION = "refresh_tokens"
+
+REFRESH_TOKENS_INDEXES = [
+    IndexModel([("expiresAt", ASCENDING)], expireAfterSeconds=0),
+    IndexModel([("family", ASCENDING)]),
+    IndexModel([("userId", ASCENDING)]),
+]
+
+CONSUMED = "consumed"
+REUSED = "reused"
+UNKNOWN = "unknown"
+
+def _token_key(jti: str) -> Binary:
+    return Binary.from_uuid(UUID(jti))
+
+class MongoRefreshTokenStore:
+    """Issued refresh tokens by jti. Each token is usable once; rotations share a family id."""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection = db[REFRESH_TOKENS_COLLECTION]
+
+    async def init_indexes(self):
+        await ensure_indexes(self.collection, REFRESH_TOKENS_INDEXES)
+
+    async def issue(self, jti: str, user_id: str, family: str, expires_at: datetime):
+        await self.collection.insert_one({
+            "_id": _token_key(jti),
+            "userId": user_id,
+            "family": family,
+            "expiresAt": expires_at,
+            "usedAt": None
+        })
+
+    async def consume(self, jti: str) -> str:
+        # Atomically marks the token used; a second presentation of the same token is a reuse
+        try:
+            key = _token_key(jti)
+        except ValueError:
+            return UNKNOWN
+        doc = await self.collection.find_one_and_update(
+            {"_id": key, "usedAt": None},
+            {"$set": {"usedAt": datetime.now(timezone.utc)}},
+            projection={"_id": 1}
+        )
+        if doc is not None:
+            return CONSUMED
+        if await self.collection.find_one({"_id": key}, {"_id": 1}) is not None:
+            return REUSED
+        return UNKNOWN
+
+    async def revoke_family(self, family: str):
+        await self.collection.delete_many({"family": family})
+
+    async def revoke_user(self, user_id: str):
+        await self.collection.delete_many({"userId": user_id})
+
+    async def reset(self):
+        await self.collection.delete_many({})
@@ -1,32 +1,191 @@
-from pymongo import ASCENDING
-from datetime import datetime
+import time
+import asyncio
+from uuid import UUID
+from bson import Binary
+from pymongo import ASCENDING, IndexModel
+from contextlib import suppress
 from pymongo.errors import DuplicateKeyError
+from datetime import datetime, timedelta, timezone
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.core.config import settings
+from app.db.indexes import ensure_indexes
+from app.db.revocation_filter import BloomFilter
+from app.core.metrics import (
+    REVOCATION_FILTER_LOOKUPS, REVOCATION_FILTER_FALSE_POSITIVES, REVOCATION_LOOKUP_DURATION,
+    REVOCATION_FILTER_STALENESS, REVOCATION_FILTER_SIZE
+)
+
 REV_TOKENS_COLLECTION = "revoked_tokens"
 
+REV_TOKENS_INDEXES = [
+    IndexModel([("expiresAt", ASCENDING)], expireAfterSeconds=0),
+    IndexModel([("revokedAt", ASCENDING)]),
+]
+
+# Polls re-read this much history to tolerate clock skew between workers
+FILTER_POLL_OVERLAP = timedelta(seconds=5)
+
+def _revocation_key(token_id: str) -> Binary | str:
+    # jti values are UUIDs, stored as 16-byte binaries; anything else (legacy full tokens) as-is
+    try:
+        return Binary.from_uuid(UUID(token_id))
+    except ValueError:
+        return token_id
+
+def _filter_key(doc_id: Binary | str) -> str:
+    if isinstance(doc_id, Binary):
+        return str(doc_id.as_uuid())
+    try:
+        return str(UUID(doc_id))
+    except ValueError:
+        return doc_id
+
 class MongoRevokedTokenStore:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.collection = db[REV_TOKENS_COLLECTION]
+        self.filter: BloomFilter | None = None
+        self._filter_synced_at = 0.0
+        self._filter_rebuilt_at = 0.0
+        self._filter_cursor: datetime | None = None
+        self._filter_task: asyncio.Task | None = None
 
     async def init_indexes(self):
-        await self.collection.create_index(
-            [("expiresAt", ASCENDING)],
-            expireAfterSeconds=0
-        )
+        await ensure_indexes(self.collection, REV_TOKENS_INDEXES)
 
-    async def revoke(self, token: str, expires_at: datetime):
+    async def revoke(self, token_id: str, expires_at: datetime):
         try:
             await self.collection.insert_one({
-                "_id": token,
-                "expiresAt": expires_at
+                "_id": _revocation_key(token_id),
+                "expiresAt": expires_at,
+                "revokedAt": datetime.now(timezone.utc)
             })
         except DuplicateKeyError:
             pass
 
-    async def is_revoked(self, token: str) -> bool:
-        doc = await self.collection.find_one({"_id": token})
+        if self.filter is not None:
+            self.filter.add(_filter_key(token_id))
+
+    def _lookup_ids(self, token_id: str, legacy_token: str | None) -> list[str]:
+        token_ids = [token_id]
+        if legacy_token and legacy_token != token_id and settings.REVOCATION_LEGACY_LOOKUP:
+            token_ids.append(legacy_token)
+        return token_ids
+
+    async def is_revoked(self, token_id: str, legacy_token: str | None = None) -> bool:
+        started = time.perf_counter()
+        token_ids = self._lookup_ids(token_id, legacy_token)
+
+        maybe_revoked = False
+        if self._filter_is_fresh():
+            if not any(_filter_key(t) in self.filter for t in token_ids):
+                REVOCATION_FILTER_LOOKUPS.labels("negative").inc()
+                REVOCATION_LOOKUP_DURATION.labels("filter").observe(time.perf_counter() - started)
+                return False
+            maybe_revoked = True
+            REVOCATION_FILTER_LOOKUPS.labels("positive").inc()
+        elif self.filter is not None:
+            REVOCATION_FILTER_LOOKUPS.labels("stale").inc()
+
+        keys = [_revocation_key(t) for t in token_ids]
+        query = {"_id": keys[0]} if len(keys) == 1 else {"_id": {"$in": keys}}
+        doc = await self.collection.find_one(query, {"_id": 1})
+        if doc is None and maybe_revoked:
+            REVOCATION_FILTER_FALSE_POSITIVES.inc()
+        REVOCATION_LOOKUP_DURATION.labels("database").observe(time.perf_counter() - started)
         return doc is not None
 
+    async def get_revoked(self, tokens: list[tuple[str, str | None]]) -> set[str]:
+        # Returns the token ids among the (token_id, legacy_token) pairs that are revoked
+        fresh = self._filter_is_fresh()
+        candidates: dict[str, str] = {}
+        for token_id, legacy_token in tokens:
+            keys = [_filter_key(t) for t in self._lookup_ids(token_id, legacy_token)]
+            if fresh:
+                if not any(key in self.filter for key in keys):
+                    REVOCATION_FILTER_LOOKUPS.labels("negative").inc()
+                    continue
+                REVOCATION_FILTER_LOOKUPS.labels("positive").inc()
+            elif self.filter is not None:
+                REVOCATION_FILTER_LOOKUPS.labels("stale").inc()
+            for key in keys:
+                candidates[key] = token_id
+
+        if not candidates:
+            return set()
+
+        cursor = self.collection.find(
+            {"_id": {"$in": [_revocation_key(key) for key in candidates]}},
+            {"_id": 1}
+        )
+        return {candidates[_filter_key(doc["_id"])] async for doc in cursor}
+
     async def reset(self):
         await self.collection.delete_many({})
+        if self.filter is not None:
+            await self.rebuild_filter()
+
+    def _filter_is_fresh(self) -> bool:
+        if self.filter is None:
+            return False
+        staleness = time.monotonic() - self._filter_synced_at
+        return staleness <= settings.REVOCATION_FILTER_STALENESS_SECONDS
+
+    async def rebuild_filter(self):
+        # Expired documents are skipped, which is how entries leave the filter
+        started = time.monotonic()
+        now = datetime.now(timezone.utc)
+        cursor = self.collection.find({"expiresAt": {"$gt": now}}, {"_id": 1})
+        ids = [_filter_key(doc["_id"]) async for doc in cursor]
+
+        capacity = max(settings.REVOCATION_FILTER_CAPACITY, 2 * len(ids))
+        new_filter = BloomFilter(capacity, settings.REVOCATION_FILTER_ERROR_RATE)
+        for token_id in ids:
+            new_filter.add(token_id)
+
+        self.filter = new_filter
+        self._filter_cursor = now - FILTER_POLL_OVERLAP
+        self._filter_synced_at = started
+        self._filter_rebuilt_at = started
+        REVOCATION_FILTER_SIZE.set(new_filter.count)
+
+    async def refresh_filter(self):
+        started = time.monotonic()
+        now = datetime.now(timezone.utc)
+        if settings.REVOCATION_LEGACY_LOOKUP:
+            # Workers still running the previous release revoke without revokedAt; stamp those so
+            # this and every other worker's next poll picks them up
+            await self.collection.update_many({"revokedAt": None}, {"$set": {"revokedAt": now}})
+        cursor = self.collection.find({"revokedAt": {"$gte": self._filter_cursor}}, {"_id": 1})
+        async for doc in cursor:
+            self.filter.add(_filter_key(doc["_id"]))
+
+        self._filter_cursor = now - FILTER_POLL_OVERLAP
+        self._filter_synced_at = started
+        REVOCATION_FILTER_SIZE.set(self.filter.count)
+
+    async def _sync_filter_loop(self):
+        while True:
+            await asyncio.sleep(settings.REVOCATION_FILTER_POLL_SECONDS)
+            try:
+                rebuild_due = time.monotonic() - self._filter_rebuilt_at >= settings.REVOCATION_FILTER_REBUILD_SECONDS
+                if rebuild_due or self.filter.is_saturated():
+                    await self.rebuild_filter()
+                else:
+                    await self.refresh_filter()
+            except Exception:
+                pass  # Lookups fall back to the database once the filter is stale
+            REVOCATION_FILTER_STALENESS.set(time.monotonic() - self._filter_synced_at)
+
+    async def start_filter_sync(self):
+        if not settings.REVOCATION_FILTER_ENABLED or self._filter_task:
+            return
+        await self.rebuild_filter()
+        self._filter_task = asyncio.create_task(self._sync_filter_loop())
+
+    async def stop_filter_sync(self):
+        if self._filter_task:
+            self._filter_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._filter_task
+            self._filter_task = None
@@ -0,0 +1,137 @@
+import json
+import logging
+from pymongo import monitoring
+
+from app.core.config import settings
+from app.core.metrics import (
+    MONGO_POOL_CHECKOUT_WAIT, MONGO_POOL_CONNECTIONS,
+    MONGO_POOL_CHECKED_OUT, MONGO_POOL_CHECKOUT_FAILURES,
+    MONGO_COMMAND_DURATION, MONGO_COMMAND_FAILURES
+)
+
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+# Where each command keeps its filter(s)
+FILTER_FIELDS = {
+    "find": "filter",
+    "findAndModify": "query",
+    "count": "query",
+    "distinct": "query",
+    "aggregate": "pipeline",
+    "delete": "deletes",
+    "update": "updates",
+}
+
+def _address(address: tuple) -> str:
+    return f"{address[0]}:{address[1]}"
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Exports connection pool (CMAP) events; callbacks run on driver threads and must stay cheap."""
+
+    def __init__(self):
+        self.checked_out: dict[str, int] = {}
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        address = _address(event.address)
+        MONGO_POOL_CONNECTIONS.labels(address).set(0)
+        MONGO_POOL_CHECKED_OUT.labels(address).set(0)
+        self.checked_out.pop(address, None)
+
+    def connection_created(self, event):
+        MONGO_POOL_CONNECTIONS.labels(_address(event.address)).inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        MONGO_POOL_CONNECTIONS.labels(_address(event.address)).dec()
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_CHECKOUT_FAILURES.labels(event.reason).inc()
+        MONGO_POOL_CHECKOUT_WAIT.observe(event.duration)
+
+    def connection_checked_out(self, event):
+        address = _address(event.address)
+        self.checked_out[address] = self.checked_out.get(address, 0) + 1
+        MONGO_POOL_CHECKED_OUT.labels(address).inc()
+        MONGO_POOL_CHECKOUT_WAIT.observe(event.duration)
+
+    def connection_checked_in(self, event):
+        address = _address(event.address)
+        self.checked_out[address] = self.checked_out.get(address, 1) - 1
+        MONGO_POOL_CHECKED_OUT.labels(address).dec()
+
+def redact(value):
+    # Keeps field names and operators, replaces every value so no user data reaches the log
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return "?"
+
+def command_filter(command_name: str, command: dict):
+    value = command.get(FILTER_FIELDS.get(command_name, ""))
+    if value is None:
+        return None
+    if command_name in ("delete", "update"):
+        # Bulk statements: only the match part ("q") of each one
+        return [redact(statement.get("q", {})) for statement in value]
+    return redact(value)
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Per-collection command latency, failure counts and a slow-command log."""
+
+    def __init__(self):
+        self._started: dict[tuple, tuple[str, dict]] = {}
+
+    def _key(self, event) -> tuple:
+        return (event.connection_id, event.request_id)
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        if not isinstance(collection, str):
+            collection = ""
+        # The command document is kept by reference; it is only redacted if the command is slow
+        self._started[self._key(event)] = (collection, event.command)
+
+    def _finished(self, event) -> str:
+        collection, command = self._started.pop(self._key(event), ("", {}))
+        seconds = event.duration_micros / 1_000_000
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(seconds)
+
+        threshold = settings.MONGODB_SLOW_QUERY_MS
+        if threshold and seconds * 1000 >= threshold:
+            slow_query_logger.warning(json.dumps({
+                "event": "slow_mongo_command",
+                "database": event.database_name,
+                "collection": collection,
+                "command": event.command_name,
+                "durationMs": round(seconds * 1000, 2),
+                "filter": command_filter(event.command_name, command),
+                "failed": isinstance(event, monitoring.CommandFailedEvent),
+            }, default=str))
+        return collection
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        collection = self._finished(event)
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
+
+pool_listener = PoolMetricsListener()
+command_listener = CommandMetricsListener()
@@ -0,0 +1,44 @@
+FULL = "full"
+AUTH = "auth"
+CREDENTIALS = "credentials"
+PUBLIC = "public"
+EXISTENCE = "existence"
+
+# Named read profiles for the users collection
+PROJECTIONS: dict[str, dict] = {
+    FULL: {"_id": 0},
+    AUTH: {"_id": 0, "id": 1, "userType": 1, "email": 1},
+    CREDENTIALS: {"_id": 0, "id": 1, "password": 1, "userType": 1, "email": 1},
+    PUBLIC: {"_id": 0, "password": 0},
+    # Covered by the unique "id" index
+    EXISTENCE: {"_id": 0, "id": 1},
+}
+
+# Profiles whose documents also satisfy a read for another profile
+COVERS: dict[str, set[str]] = {
+    FULL: {FULL, CREDENTIALS, AUTH, PUBLIC, EXISTENCE},
+    CREDENTIALS: {CREDENTIALS, AUTH, EXISTENCE},
+    AUTH: {AUTH, EXISTENCE},
+    PUBLIC: {PUBLIC, AUTH, EXISTENCE},
+    EXISTENCE: {EXISTENCE},
+}
+
+# What remains of a profile once the password hash is removed
+WITHOUT_SECRETS: dict[str, str] = {FULL: PUBLIC, CREDENTIALS: AUTH}
+
+def covers(available: str, requested: str) -> bool:
+    return requested in COVERS[available]
+
+def without_secrets(profile: str, doc: dict) -> tuple[str, dict]:
+    if profile not in WITHOUT_SECRETS:
+        return profile, doc
+    return WITHOUT_SECRETS[profile], {k: v for k, v in doc.items() if k != "password"}
+
+def merge(current: tuple[str, dict] | None, profile: str, doc: dict) -> tuple[str, dict]:
+    # Combines two reads of the same user; credentials + public together cover every field
+    if current is None or covers(profile, current[0]):
+        return profile, doc
+    current_profile, current_doc = current
+    if covers(current_profile, profile):
+        return current_profile, {**current_doc, **doc}
+    return FULL, {**current_doc, **doc}
@@ -1,5 +1,8 @@
+from typing import List, Optional
 from pydantic import BaseModel, EmailStr, SecretStr, Field, field_validator, model_validator
 
+from app.core.config import settings
+
 from app.schemas.user import OwnerOut, ClinicOut, UserType
 
 from app.utils.validators import(
@@ -53,8 +56,24 @@ class ChangePasswordRequest(BaseModel):
 class UserLoginResponse(BaseModel):
     success: bool = Field(..., description="Indicates if login was successful", example=True)
     token: str = Field(..., description="JWT access token", example="eyJhbGciOiJIUzI1NiIsInR5cCI...")
+    refreshToken: Optional[str] = Field(None, description="Single-use refresh token for `/auth/refresh`", example="eyJhbGciOiJIUzI1NiIsInR5cCI...")
     user: OwnerOut | ClinicOut = Field(..., description="User profile data")
 
+class RefreshTokenRequest(BaseModel):
+    refreshToken: str = Field(..., description="Refresh token from login or the previous refresh", example="eyJhbGciOiJIUzI1NiIsInR5cCI...")
+
+    @field_validator("refreshToken")
+    def validate_token(cls, value):
+        return validate_token_data(value)
+
+class RefreshTokenResponse(BaseModel):
+    success: bool = Field(..., description="Operation status", example=True)
+    token: str = Field(..., description="New JWT access token", example="eyJhbGciOiJIUzI1NiIsInR5cCI...")
+    refreshToken: str = Field(..., description="Replacement refresh token; the one sent is no longer valid", example="eyJhbGciOiJIUzI1NiIsInR5cCI...")
+
+class LogoutRequest(BaseModel):
+    refreshToken: Optional[str] = Field(None, description="Refresh token of the session to end", example="eyJhbGciOiJIUzI1NiIsInR5cCI...")
+
 class BaseResponse(BaseModel):
     success: bool = Field(..., description="Operation status", example=True)
     message: str = Field(..., description="Informational message", example="Password updated successfully.")
@@ -63,4 +82,26 @@ class TokenVerificationResponse(BaseModel):
     success: bool = Field(..., description="Whether the token is valid", example=True)
     user_id: str = Field(..., description="User ID extracted from the token", example="65b4f50a-b8c6-4d04-8e54-730675247781")
     user_type: UserType = Field(..., description="Type of user (owner or clinic)", example="owner")
-    email: EmailStr = Field(..., description="Email of the user", example="esperanza@clinic.co")
\ No newline at end of file
+    email: EmailStr = Field(..., description="Email of the user", example="esperanza@clinic.co")
+
+class BatchTokenVerificationRequest(BaseModel):
+    tokens: List[str] = Field(..., description="Access tokens to verify", example=["eyJhbGciOiJIUzI1NiIsInR5cCI..."])
+
+    @field_validator("tokens")
+    def validate_tokens(cls, value):
+        if not value:
+            raise ValueError("At least one token is required.")
+        if len(value) > settings.BATCH_VERIFY_MAX_TOKENS:
+            raise ValueError(f"At most {settings.BATCH_VERIFY_MAX_TOKENS} tokens can be verified per request.")
+        return value
+
+class TokenVerificationResult(BaseModel):
+    success: bool = Field(..., description="Whether this token is valid", example=True)
+    user_id: Optional[str] = Field(None, description="User ID extracted from the token", example="65b4f50a-b8c6-4d04-8e54-730675247781")
+    user_type: Optional[UserType] = Field(None, description="Type of user (owner or clinic)", example="owner")
+    email: Optional[EmailStr] = Field(None, description="Email of the user", example="esperanza@clinic.co")
+    message: Optional[str] = Field(None, description="Reason the token was rejected", example="Token has been revoked.")
+
+class BatchTokenVerificationResponse(BaseModel):
+    success: bool = Field(..., description="Operation status", example=True)
+    results: List[TokenVerificationResult] = Field(..., description="One result per token, in request order")
\ No newline at end of file
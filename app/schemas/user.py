@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, EmailStr, SecretStr, Field, field_validator, model_validator
 
@@ -202,9 +202,28 @@ class ClinicUpdate(BaseUserUpdate):
 class BaseRegisterResponse(BaseModel):
     success: bool
     token: str = Field(..., description="JWT access token")
+    refreshToken: Optional[str] = Field(None, description="Single-use refresh token for `/auth/refresh`")
 
 class OwnerRegisterResponse(BaseRegisterResponse):
     user: OwnerOut
 
 class ClinicRegisterResponse(BaseRegisterResponse):
-    user: ClinicOut
\ No newline at end of file
+    user: ClinicOut
+
+class UserPageResponse(BaseModel):
+    success: bool = Field(..., description="Operation status", example=True)
+    users: List[OwnerOut | ClinicOut] = Field(..., description="Users in creation order")
+    nextCursor: Optional[str] = Field(None, description="Cursor for the next page; null on the last page")
+
+class ImportRowResult(BaseModel):
+    row: int = Field(..., description="1-based row number in the uploaded file")
+    success: bool
+    email: Optional[str] = None
+    id: Optional[str] = Field(None, description="Identifier of the created user")
+    errors: List[str] = Field(default_factory=list)
+
+class UserImportResponse(BaseModel):
+    success: bool = Field(..., description="Operation status", example=True)
+    imported: int = Field(..., description="Rows imported", example=1200)
+    failed: int = Field(..., description="Rows rejected", example=3)
+    results: List[ImportRowResult] = Field(..., description="Per-row outcome, in file order")
\ No newline at end of file
@@ -2,11 +2,19 @@ from datetime import datetime, timezone
 from fastapi import status, HTTPException
 
 from app.db.mongo import MongoUserDB
-from app.utils.email import send_password_reset_email
+from app.db.projections import AUTH, CREDENTIALS, EXISTENCE
+from app.db.mongo_email_outbox import MongoEmailOutbox
+from app.services.email_service import queue_password_reset_email
 from app.db.mongo_token_store import MongoRevokedTokenStore
-from app.core.security import hash_password, verify_password
+from app.db.mongo_refresh_token_store import MongoRefreshTokenStore
+from app.core.throttle import LoginThrottle
+from app.core.metrics import LOGIN_ATTEMPTS
+from app.core.security import hash_password_async, verify_password_async, verify_and_update_password_async
 from app.utils.response_builder import build_auth_response, build_base_response
-from app.core.tokens import create_reset_token, verify_token, revoke_token, TokenType
+from app.core.tokens import(
+    verify_token, verify_tokens, revoke_token, TokenType,
+    create_access_token, create_refresh_token, rotate_refresh_token, revoke_refresh_token
+)
 
 from app.schemas.user import(
     UserType,
@@ -14,16 +22,7 @@ from app.schemas.user import(
     ClinicRegister
 )
 
-async def register_user(user_data: OwnerRegister | ClinicRegister, user_type: UserType, user_db: MongoUserDB):
-    existing = await user_db.get_by_email(user_data.email)
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered."
-        )
-    
-    hashed_password = hash_password(user_data.password.get_secret_value())
-
+def build_user_document(user_data: OwnerRegister | ClinicRegister, user_type: UserType, hashed_password: str) -> dict:
     user_info = user_data.model_dump(exclude={"password", "confirmPassword"})
     user_info["email"] = user_data.email.strip().lower()
 
@@ -35,45 +34,124 @@ async def register_user(user_data: OwnerRegister | ClinicRegister, user_type: Us
     if user_type == UserType.CLINIC and isinstance(user_data, ClinicRegister):
         user_info["locality"] = user_data.locality.value
 
-    created = await user_db.create({**user_info, "password": hashed_password})
-    return build_auth_response(created)
+    return {**user_info, "password": hashed_password}
 
-async def authenticate_user(email: str, password: str, user_db: MongoUserDB):
-    user = await user_db.get_by_email(email.strip().lower())
-    
-    if not user or not verify_password(password, user["password"]):
+async def register_user(
+    user_data: OwnerRegister | ClinicRegister,
+    user_type: UserType,
+    user_db: MongoUserDB,
+    refresh_store: MongoRefreshTokenStore | None = None,
+):
+    hashed_password = await hash_password_async(user_data.password.get_secret_value())
+
+    try:
+        created = await user_db.create(build_user_document(user_data, user_type, hashed_password))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered."
+        )
+
+    refresh_token = await create_refresh_token(created["id"], refresh_store) if refresh_store else None
+    return build_auth_response(created, refresh_token)
+
+async def authenticate_user(
+    email: str,
+    password: str,
+    user_db: MongoUserDB,
+    refresh_store: MongoRefreshTokenStore | None = None,
+    throttle: LoginThrottle | None = None,
+    client_ip: str | None = None,
+):
+    email = email.strip().lower()
+    if throttle:
+        try:
+            await throttle.check(client_ip, email)
+        except HTTPException:
+            LOGIN_ATTEMPTS.labels("throttled").inc()
+            raise
+
+    user = await user_db.get_by_email(email)
+    if not user:
+        LOGIN_ATTEMPTS.labels("failure").inc()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password."
         )
-        
-    return build_auth_response(user)
+
+    valid, new_hash = await verify_and_update_password_async(password, user["password"])
+    if not valid:
+        LOGIN_ATTEMPTS.labels("failure").inc()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password."
+        )
+
+    # Transparently re-hash passwords stored with an outdated cost factor
+    if new_hash:
+        await user_db.update(user["id"], {"password": new_hash}, profile=EXISTENCE)
+        user["password"] = new_hash
+
+    LOGIN_ATTEMPTS.labels("success").inc()
+    if throttle:
+        await throttle.succeeded(email)
+
+    refresh_token = await create_refresh_token(user["id"], refresh_store) if refresh_store else None
+    return build_auth_response(user, refresh_token)
+
+async def refresh_session(refresh_token: str, user_db: MongoUserDB, refresh_store: MongoRefreshTokenStore) -> dict:
+    payload, new_refresh_token = await rotate_refresh_token(refresh_token, refresh_store)
+
+    user = await user_db.get_by_id(payload["sub"], AUTH)
+    if not user:
+        await refresh_store.revoke_family(payload["fam"])
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found."
+        )
+
+    return {
+        "success": True,
+        "token": create_access_token({"sub": user["id"], "userType": user["userType"], "email": user["email"]}),
+        "refreshToken": new_refresh_token
+    }
 
 async def update_password_with_token(user_id: str, new_password: str, user_db: MongoUserDB):
-    user = await user_db.get_by_id(user_id)
+    user = await user_db.get_by_id(user_id, EXISTENCE)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found."
         )
     
-    new_hashed = hash_password(new_password)
-    await user_db.update(user_id, {"password": new_hashed})
+    new_hashed = await hash_password_async(new_password)
+    await user_db.update(user_id, {"password": new_hashed}, profile=EXISTENCE)
     return build_base_response(message="Password updated successfully.")
 
-async def change_password(user: dict, current_password: str, new_password: str, user_db: MongoUserDB):
-    if not verify_password(current_password, user["password"]):
+async def change_password(
+    user: dict,
+    current_password: str,
+    new_password: str,
+    user_db: MongoUserDB,
+    refresh_store: MongoRefreshTokenStore | None = None,
+):
+    # The hash is read from MongoDB, not the cached user, so a change made on another worker counts
+    credentials = await user_db.get_by_id(user["id"], CREDENTIALS)
+    if not credentials or not await verify_password_async(current_password, credentials["password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Current password is incorrect."
         )
     
-    new_hashed = hash_password(new_password)
-    await user_db.update(user["id"], {"password": new_hashed})
+    new_hashed = await hash_password_async(new_password)
+    await user_db.update(user["id"], {"password": new_hashed}, profile=EXISTENCE)
+    # Other sessions must log in again with the new password
+    if refresh_store:
+        await refresh_store.revoke_user(user["id"])
     return build_base_response(message="Password changed successfully.")
 
 async def get_user_by_email(email: str, user_db: MongoUserDB):
-    user = await user_db.get_by_email(email)
+    user = await user_db.get_by_email(email, AUTH)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -97,7 +175,7 @@ async def verify_user_token(
             detail="Invalid or expired token."
         )
 
-    user = await user_db.get_by_id(user_id)
+    user = await user_db.get_by_id(user_id, EXISTENCE)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -111,12 +189,37 @@ async def verify_user_token(
         "email": email
     }
 
+async def verify_user_tokens(
+    tokens: list[str],
+    user_db: MongoUserDB,
+    store: MongoRevokedTokenStore,
+) -> dict:
+    verified = await verify_tokens(tokens, TokenType.ACCESS, store)
+    users = await user_db.get_by_ids([p["sub"] for p in verified if isinstance(p, dict)], EXISTENCE)
 
-async def initiate_password_reset(email: str, user_db: MongoUserDB) -> dict:
+    results = []
+    for payload in verified:
+        if isinstance(payload, HTTPException):
+            results.append({"success": False, "message": payload.detail})
+        elif payload["sub"] not in users:
+            results.append({"success": False, "message": "User not found."})
+        else:
+            results.append({
+                "success": True,
+                "user_id": payload["sub"],
+                "user_type": payload.get("userType"),
+                "email": payload.get("email")
+            })
+
+    return {
+        "success": True,
+        "results": results
+    }
+
+async def initiate_password_reset(email: str, user_db: MongoUserDB, outbox: MongoEmailOutbox) -> dict:
     try:
         user = await get_user_by_email(email, user_db)
-        reset_token = create_reset_token(user["id"])
-        send_password_reset_email(user["email"], reset_token)
+        await queue_password_reset_email(outbox, user["email"], user["id"])
     except HTTPException:
         pass  #Prevent email enumeration
     except Exception:
@@ -129,6 +232,7 @@ async def reset_password(
     new_password: str,
     user_db: MongoUserDB,
     store: MongoRevokedTokenStore,
+    refresh_store: MongoRefreshTokenStore | None = None,
 ) -> dict:
     payload = await verify_token(token, TokenType.RESET, store)
     user_id = payload.get("sub")
@@ -141,9 +245,19 @@ async def reset_password(
 
     result = await update_password_with_token(user_id, new_password, user_db)
     await revoke_token(token, store)
+    if refresh_store:
+        await refresh_store.revoke_user(user_id)
     return result
 
-async def logout_user(token: str, store: MongoRevokedTokenStore) -> dict:
+async def logout_user(
+    token: str,
+    store: MongoRevokedTokenStore,
+    refresh_token: str | None = None,
+    refresh_store: MongoRefreshTokenStore | None = None,
+) -> dict:
+    if refresh_token and refresh_store:
+        await revoke_refresh_token(refresh_token, refresh_store)
+
     success = await revoke_token(token, store)
     if not success:
         raise HTTPException(
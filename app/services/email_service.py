@@ -0,0 +1,114 @@
+import asyncio
+from contextlib import suppress
+from datetime import timedelta
+
+from app.core.config import settings
+from app.core.tokens import create_reset_token
+from app.db.mongo_email_outbox import MongoEmailOutbox
+from app.core.metrics import EMAIL_OUTBOX_PENDING, EMAIL_DELIVERIES
+from app.utils.email import SMTPConnectionPool, send_password_reset_email
+
+PASSWORD_RESET = "password_reset"
+
+MAX_BACKOFF_SECONDS = 300
+
+class EmailOutboxWorker:
+    def __init__(self, outbox: MongoEmailOutbox):
+        self.outbox = outbox
+        self.pool = SMTPConnectionPool(settings.SMTP_POOL_SIZE)
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._tasks: list[asyncio.Task] = []
+
+    def notify(self):
+        self._wakeup.set()
+
+    async def _deliver(self, item: dict) -> bool:
+        if item["kind"] == PASSWORD_RESET:
+            # Tokens are minted at delivery time so no credential sits in the outbox
+            token = create_reset_token(item["data"]["userId"])
+            return await asyncio.to_thread(send_password_reset_email, item["to"], token, self.pool)
+        return False
+
+    async def process_one(self) -> bool:
+        item = await self.outbox.claim(timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS))
+        if item is None:
+            return False
+
+        error = "Delivery failed."
+        try:
+            delivered = await self._deliver(item)
+        except Exception as e:
+            delivered = False
+            error = f"{type(e).__name__}: {e}"
+
+        if delivered:
+            await self.outbox.mark_sent(item["_id"])
+            EMAIL_DELIVERIES.labels(item["kind"], "sent").inc()
+        elif item["attempts"] >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            await self.outbox.mark_failed(item, None, error)
+            EMAIL_DELIVERIES.labels(item["kind"], "failed").inc()
+        else:
+            backoff = settings.EMAIL_OUTBOX_BACKOFF_SECONDS * 2 ** (item["attempts"] - 1)
+            await self.outbox.mark_failed(item, timedelta(seconds=min(backoff, MAX_BACKOFF_SECONDS)), error)
+            EMAIL_DELIVERIES.labels(item["kind"], "retry").inc()
+        return True
+
+    async def _run(self):
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                processed = await self.process_one()
+            except Exception:
+                processed = False  # Database unavailable; try again on the next poll
+            if not processed and not self._stopping:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), settings.EMAIL_OUTBOX_POLL_SECONDS)
+
+    async def _report_pending(self):
+        while True:
+            with suppress(Exception):
+                EMAIL_OUTBOX_PENDING.set(await self.outbox.pending_count())
+            await asyncio.sleep(settings.EMAIL_OUTBOX_POLL_SECONDS)
+
+    async def _drain(self):
+        while await self.process_one():
+            pass
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(settings.EMAIL_OUTBOX_WORKERS)]
+        self._tasks.append(asyncio.create_task(self._report_pending()))
+
+    async def stop(self):
+        self._stopping = True
+        self._wakeup.set()
+        workers, reporter = self._tasks[:-1], self._tasks[-1]
+        reporter.cancel()
+        await asyncio.gather(*workers, reporter, return_exceptions=True)
+
+        # Deliver whatever is already due before the process exits
+        with suppress(Exception):
+            await asyncio.wait_for(self._drain(), settings.EMAIL_OUTBOX_DRAIN_TIMEOUT_SECONDS)
+        await asyncio.to_thread(self.pool.close)
+
+_worker: EmailOutboxWorker | None = None
+
+def start_email_worker(outbox: MongoEmailOutbox):
+    global _worker
+    if _worker is None:
+        _worker = EmailOutboxWorker(outbox)
+        _worker.start()
+
+async def stop_email_worker():
+    global _worker
+    if _worker is not None:
+        await _worker.stop()
+        _worker = None
+
+def notify_email_worker():
+    if _worker is not None:
+        _worker.notify()
+
+async def queue_password_reset_email(outbox: MongoEmailOutbox, to_email: str, user_id: str):
+    await outbox.enqueue(PASSWORD_RESET, to_email, {"userId": user_id})
+    notify_email_worker()
@@ -0,0 +1,169 @@
+import io
+import csv
+import json
+import codecs
+import asyncio
+from typing import AsyncIterator
+from pydantic import ValidationError
+from fastapi import HTTPException, status
+
+from app.db.mongo import MongoUserDB
+from app.core.config import settings
+from app.core.security import hash_passwords_async
+from app.services.auth_service import build_user_document
+from app.schemas.user import UserType, OwnerRegister, ClinicRegister
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+def _too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[list[str]]:
+    """Yields the body in batches of up to IMPORT_CHUNK_SIZE records (a CSV header comes first), stopping at the size caps."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    size = 0
+    rows = -1 if fmt == CSV else 0
+    pending = ""
+    record: list[str] = []
+    quotes = 0
+    batch: list[str] = []
+
+    async def lines() -> AsyncIterator[str]:
+        nonlocal size, pending
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > settings.IMPORT_MAX_BYTES:
+                    raise _too_large(f"Import files are limited to {settings.IMPORT_MAX_BYTES} bytes.")
+                *complete, pending = (pending + decoder.decode(chunk)).split("\n")
+                for line in complete:
+                    yield line.rstrip("\r")
+            yield (pending + decoder.decode(b"", final=True)).rstrip("\r")
+        except UnicodeDecodeError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Import file must be UTF-8 encoded."
+            )
+
+    async for line in lines():
+        record.append(line)
+        quotes += line.count('"')
+        # A quoted CSV field may span lines: the record ends once its quotes are balanced
+        if fmt == CSV and quotes % 2:
+            continue
+        text = "\n".join(record)
+        record, quotes = [], 0
+        if not text.strip():
+            continue
+
+        rows += 1
+        if rows > settings.IMPORT_MAX_ROWS:
+            raise _too_large(f"At most {settings.IMPORT_MAX_ROWS} rows can be imported per request.")
+        batch.append(text)
+        if len(batch) >= settings.IMPORT_CHUNK_SIZE:
+            yield batch
+            batch = []
+
+    if record:
+        # Unbalanced quotes up to the end of the body; the CSV parser reports what it can
+        batch.append("\n".join(record))
+    if batch:
+        yield batch
+
+def parse_rows(records: list[str], fmt: str, header: str | None = None) -> list[dict | str]:
+    # Rows that cannot be parsed are kept as error strings so row numbers stay aligned
+    if fmt == CSV:
+        return [dict(row) for row in csv.DictReader(io.StringIO("\n".join([header or "", *records])))]
+
+    rows: list[dict | str] = []
+    for line in records:
+        try:
+            row = json.loads(line)
+            rows.append(row if isinstance(row, dict) else "Row must be a JSON object.")
+        except json.JSONDecodeError:
+            rows.append("Invalid JSON.")
+    return rows
+
+def _validation_messages(error: ValidationError) -> list[str]:
+    # Inputs are left out on purpose: rows carry passwords
+    return [f"{'.'.join(str(loc) for loc in e['loc'])}: {e['msg']}" for e in error.errors()]
+
+def _validate_chunk(
+    records: list[str],
+    fmt: str,
+    header: str | None,
+    schema: type[OwnerRegister] | type[ClinicRegister],
+    first_row: int,
+) -> tuple[list[tuple[int, OwnerRegister | ClinicRegister]], list[dict]]:
+    valid: list[tuple[int, OwnerRegister | ClinicRegister]] = []
+    failures: list[dict] = []
+    for offset, row in enumerate(parse_rows(records, fmt, header)):
+        row_number = first_row + offset
+        if isinstance(row, str):
+            failures.append({"row": row_number, "success": False, "errors": [row]})
+            continue
+
+        row = {**row}
+        row.setdefault("confirmPassword", row.get("password"))
+        try:
+            valid.append((row_number, schema.model_validate(row)))
+        except ValidationError as e:
+            email = row.get("email")
+            failures.append({
+                "row": row_number,
+                "success": False,
+                "email": email if isinstance(email, str) else None,
+                "errors": _validation_messages(e)
+            })
+    return valid, failures
+
+async def import_users(records: AsyncIterator[list[str]], fmt: str, user_type: UserType, user_db: MongoUserDB) -> dict:
+    schema = ClinicRegister if user_type == UserType.CLINIC else OwnerRegister
+    results = []
+
+    # Every chunk is parsed and validated off the event loop before anything is written, so a
+    # file rejected for its size leaves no partial import behind
+    chunks: list[list[tuple[int, OwnerRegister | ClinicRegister]]] = []
+    header = None
+    next_row = 1
+    async for batch in records:
+        if fmt == CSV and header is None:
+            header, batch = batch[0], batch[1:]
+            if not batch:
+                continue
+        valid, failures = await asyncio.to_thread(_validate_chunk, batch, fmt, header, schema, next_row)
+        next_row += len(batch)
+        results.extend(failures)
+        if valid:
+            chunks.append(valid)
+
+    for valid in chunks:
+        try:
+            hashes = await hash_passwords_async(
+                [data.password.get_secret_value() for _, data in valid],
+                settings.IMPORT_HASH_PARALLELISM
+            )
+        except HTTPException as e:
+            results.extend({"row": n, "success": False, "email": data.email, "errors": [e.detail]} for n, data in valid)
+            continue
+
+        docs = [build_user_document(data, user_type, hashed) for (_, data), hashed in zip(valid, hashes)]
+        created, errors = await user_db.create_many(docs)
+        for (row_number, _), doc, error in zip(valid, created, errors):
+            results.append({
+                "row": row_number,
+                "success": error is None,
+                "email": doc["email"],
+                "id": doc["id"] if error is None else None,
+                "errors": [error] if error else []
+            })
+
+    results.sort(key=lambda result: result["row"])
+    imported = sum(1 for result in results if result["success"])
+    return {
+        "success": True,
+        "imported": imported,
+        "failed": len(results) - imported,
+        "results": results
+    }
@@ -1,16 +1,22 @@
+import json
+import base64
+from datetime import datetime
+from typing import AsyncIterator, Optional
 from fastapi import HTTPException, status
 
 from app.db.mongo import MongoUserDB
-from app.schemas.user import UserType, Locality
+from app.core.config import settings
+from app.db.projections import PUBLIC
+from app.schemas.user import UserType, Locality, OwnerOut, ClinicOut
 from app.utils.response_builder import get_user_output_model
 
-async def get_user_profile(user: dict, user_db: MongoUserDB) -> dict:
-    db_user = await user_db.get_by_id(user["id"])
+async def get_user_profile(user: dict, user_db: MongoUserDB) -> OwnerOut | ClinicOut:
+    db_user = await user_db.get_by_id(user["id"], PUBLIC)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found.")
     return get_user_output_model(db_user)
 
-async def update_user_profile(user: dict, updates: dict, user_db: MongoUserDB) -> dict:
+async def update_user_profile(user: dict, updates: dict, user_db: MongoUserDB) -> OwnerOut | ClinicOut:
     if user["userType"] != UserType.CLINIC and "locality" in updates:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -18,7 +24,7 @@ async def update_user_profile(user: dict, updates: dict, user_db: MongoUserDB) -
         )
 
     try:
-        updated_user = await user_db.update(user["id"], updates)
+        updated_user = await user_db.update(user["id"], updates, profile=PUBLIC)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -46,3 +52,62 @@ async def delete_user_account(user: dict, user_db: MongoUserDB) -> dict:
         "success": True,
         "message": "Account deleted successfully."
     }
+
+def _encode_cursor(user: dict) -> str:
+    raw = json.dumps({"c": user["createdAt"].isoformat(), "i": user["id"]}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(raw["c"]), str(raw["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor."
+        )
+
+async def list_users(
+    user_db: MongoUserDB,
+    limit: int,
+    cursor: Optional[str] = None,
+    user_type: Optional[UserType] = None,
+    locality: Optional[Locality] = None,
+) -> dict:
+    after = _decode_cursor(cursor) if cursor else None
+    users = await user_db.get_page(
+        limit, after,
+        user_type.value if user_type else None,
+        locality.value if locality else None
+    )
+
+    return {
+        "success": True,
+        "users": [get_user_output_model(user) for user in users],
+        "nextCursor": _encode_cursor(users[-1]) if len(users) == limit else None
+    }
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+async def export_users(
+    user_db: MongoUserDB,
+    user_type: Optional[UserType] = None,
+    locality: Optional[Locality] = None,
+) -> AsyncIterator[bytes]:
+    # One chunk per cursor batch keeps memory flat regardless of collection size
+    batch_size = settings.USER_EXPORT_BATCH_SIZE
+    lines: list[str] = []
+    async for user in user_db.iter_users(
+        user_type.value if user_type else None,
+        locality.value if locality else None,
+        batch_size=batch_size
+    ):
+        lines.append(json.dumps(user, default=_json_default, ensure_ascii=False))
+        if len(lines) >= batch_size:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
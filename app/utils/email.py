@@ -1,12 +1,13 @@
+import queue
 import smtplib
 import tempfile
 import webbrowser
 from pathlib import Path
 from urllib.parse import urljoin
 from email.message import EmailMessage
-from jinja2 import Environment, FileSystemLoader
 
 from app.core.config import settings
+from app.utils.templates import TemplateRegistry
 
 GMAIL_USER=settings.GMAIL_USER
 GMAIL_PASS=settings.GMAIL_PASS
@@ -17,40 +18,89 @@ EMAIL_FROM_NAME=settings.EMAIL_FROM_NAME
 FRONTEND_URL=settings.FRONTEND_URL
 RESET_PASSWORD_URL=settings.RESET_PASSWORD_URL
 
+SMTP_HOST=settings.SMTP_HOST
+SMTP_PORT=settings.SMTP_PORT
+
 EMAIL_RESET_URL = urljoin(settings.FRONTEND_URL + "/", settings.RESET_PASSWORD_URL.lstrip("/"))
 
-def render_email_templates(user_email: str, reset_link: str) -> tuple[str, str] | bool:
-    try:
-        env = Environment(loader=FileSystemLoader(EMAIL_TEMPLATES_DIR))
-        html_template = env.get_template("password_reset.html")
-        txt_template = env.get_template("password_reset.txt")
-
-        variables = {
-            "user_email": user_email,
-            "reset_link": reset_link
-        }
-
-        html_content = html_template.render(**variables)
-        txt_content = txt_template.render(**variables)
-        return html_content, txt_content
-    except Exception as e:
-        return False
+PASSWORD_RESET_TEMPLATES = ("password_reset.html", "password_reset.txt")
 
-def send_password_reset_email(to_email: str, token: str) -> bool:
-    if settings.DEBUG == True:
-        print(f"[MOCK EMAIL] To: {to_email}, Token: {token}")
-        return True
+# Compiled once at import; DEBUG reloads templates edited on disk
+template_registry = TemplateRegistry(
+    EMAIL_TEMPLATES_DIR,
+    bytecode_cache_dir=settings.EMAIL_TEMPLATES_BYTECODE_CACHE_DIR,
+    auto_reload=settings.DEBUG
+)
 
-    if not GMAIL_USER or not GMAIL_PASS:
-        return False
-    
-    reset_link = f"{EMAIL_RESET_URL}/{token}"
+def render_email_templates(user_email: str, reset_link: str) -> tuple[str, str]:
+    return render_password_reset_batch([(user_email, reset_link)])[0]
 
-    rendered = render_email_templates(to_email, reset_link)
-    if not rendered:
-        return False
+def render_password_reset_batch(recipients: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    contexts = [{"user_email": user_email, "reset_link": reset_link} for user_email, reset_link in recipients]
+    return template_registry.render_batch(PASSWORD_RESET_TEMPLATES, contexts)
+
+class SMTPConnectionPool:
+    """Reuses logged-in SMTP connections across messages. Methods block; call them from a worker thread."""
+
+    def __init__(self, size: int):
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+
+    def _connect(self) -> smtplib.SMTP:
+        if settings.SMTP_USE_SSL:
+            smtp = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS)
+        else:
+            smtp = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS)
+        if settings.SMTP_USE_AUTH:
+            smtp.login(GMAIL_USER, GMAIL_PASS)
+        return smtp
+
+    @staticmethod
+    def _discard(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
 
-    html_content, plain_text = rendered
+    def send(self, msg: EmailMessage):
+        try:
+            smtp = self._idle.get_nowait()
+            reused = True
+        except queue.Empty:
+            smtp = self._connect()
+            reused = False
+
+        try:
+            smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._discard(smtp)
+            if not reused:
+                raise
+            # Idle connections may have been closed by the server; retry once on a fresh one
+            smtp = self._connect()
+            try:
+                smtp.send_message(msg)
+            except Exception:
+                self._discard(smtp)
+                raise
+        except Exception:
+            self._discard(smtp)
+            raise
+
+        try:
+            self._idle.put_nowait(smtp)
+        except queue.Full:
+            self._discard(smtp)
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+def build_password_reset_message(to_email: str, token: str) -> EmailMessage:
+    reset_link = f"{EMAIL_RESET_URL}/{token}"
+    html_content, plain_text = render_email_templates(to_email, reset_link)
 
     msg = EmailMessage()
     msg["Subject"] = f"Restablecimiento de contraseña - {EMAIL_FROM_NAME}"
@@ -58,11 +108,16 @@ def send_password_reset_email(to_email: str, token: str) -> bool:
     msg["To"] = to_email
     msg.set_content(plain_text)
     msg.add_alternative(html_content, subtype="html")
+    return msg
 
-    try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as smtp:
-            smtp.login(GMAIL_USER, GMAIL_PASS)
-            smtp.send_message(msg)
+def send_password_reset_email(to_email: str, token: str, pool: SMTPConnectionPool) -> bool:
+    if settings.DEBUG == True:
+        print(f"[MOCK EMAIL] To: {to_email}, Token: {token}")
         return True
-    except Exception as e:
-        return False
\ No newline at end of file
+
+    if settings.SMTP_USE_AUTH and (not GMAIL_USER or not GMAIL_PASS):
+        return False
+
+    # Rendering and SMTP errors propagate so the outbox records why delivery failed
+    pool.send(build_password_reset_message(to_email, token))
+    return True
@@ -1,25 +1,32 @@
+from fastapi import Response
+from pydantic import BaseModel
+
 from app.core.tokens import create_access_token
+from app.schemas.auth import UserLoginResponse
 from app.schemas.user import UserType, OwnerOut, ClinicOut
 
-def get_user_output_model(user: dict):
-    user_copy = user.copy()
-    user_copy.pop("password", None)
-
-    if user_copy["userType"] == UserType.CLINIC:
-        return ClinicOut(**user_copy)
+def get_user_output_model(user: dict) -> OwnerOut | ClinicOut:
+    # Output models ignore unknown keys such as "password", so no copy is needed
+    if user["userType"] == UserType.CLINIC:
+        return ClinicOut.model_validate(user)
     else:
-        return OwnerOut(**user_copy)
+        return OwnerOut.model_validate(user)
 
-def build_auth_response(user: dict) -> dict:
+def build_auth_response(user: dict, refresh_token: str | None = None) -> UserLoginResponse:
     token_data = {"sub": user["id"], "userType": user["userType"], "email": user["email"]}
     token = create_access_token(token_data)
-    user_out = get_user_output_model(user)
 
-    return {
-        "success": True,
-        "user": user_out,
-        "token": token
-    }
+    # The user model was just validated and the rest are our own values, so skip re-validation
+    return UserLoginResponse.model_construct(
+        success=True,
+        token=token,
+        refreshToken=refresh_token,
+        user=get_user_output_model(user)
+    )
+
+def json_response(model: BaseModel, status_code: int = 200) -> Response:
+    # Returning a Response skips FastAPI's response_model validation; pydantic-core encodes to JSON directly
+    return Response(content=model.model_dump_json(), status_code=status_code, media_type="application/json")
 
 def build_base_response(success: bool = True, message: str = None) -> dict:
     response = {"success": success}
@@ -0,0 +1,37 @@
+import time
+from typing import Iterable
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, Template
+
+from app.core.metrics import EMAIL_RENDER_DURATION
+
+class TemplateRegistry:
+    """Compiles every template in a directory once; with auto_reload, edited files are recompiled on use."""
+
+    def __init__(self, templates_dir: str, bytecode_cache_dir: str | None = None, auto_reload: bool = False):
+        bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir) if bytecode_cache_dir else FileSystemBytecodeCache()
+        self.auto_reload = auto_reload
+        self.env = Environment(
+            loader=FileSystemLoader(templates_dir),
+            bytecode_cache=bytecode_cache,
+            auto_reload=auto_reload
+        )
+        self.templates: dict[str, Template] = {
+            name: self.env.get_template(name) for name in self.env.list_templates()
+        }
+
+    def get(self, name: str) -> Template:
+        if self.auto_reload or name not in self.templates:
+            # The environment checks the file's mtime and recompiles when it changed
+            self.templates[name] = self.env.get_template(name)
+        return self.templates[name]
+
+    def render(self, names: tuple[str, ...], context: dict) -> tuple[str, ...]:
+        return self.render_batch(names, [context])[0]
+
+    def render_batch(self, names: tuple[str, ...], contexts: Iterable[dict]) -> list[tuple[str, ...]]:
+        templates = [self.get(name) for name in names]
+        start = time.perf_counter()
+        rendered = [tuple(template.render(context) for template in templates) for context in contexts]
+        if rendered:
+            EMAIL_RENDER_DURATION.labels(",".join(names)).observe((time.perf_counter() - start) / len(rendered))
+        return rendered
@@ -0,0 +1,67 @@
+"""Production server settings: gunicorn -c gunicorn.conf.py main:app
+
+Every value can be overridden from the environment (see README, "Production server").
+"""
+import os
+import math
+import shutil
+
+def _cpu_quota() -> int:
+    # Cores this container may use: cgroup CPU quota if set, otherwise the CPU affinity mask
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        try:
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                quota = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+            if quota > 0:
+                cpus = min(cpus, math.ceil(quota / period))
+        except (OSError, ValueError):
+            pass
+    return max(1, cpus)
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", _cpu_quota()))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app once in the master; each worker still opens its own Motor client,
+# hash pool and background tasks in the lifespan, which runs after fork
+preload_app = os.getenv("PRELOAD_APP", "true").lower() == "true"
+
+# Recycle workers gradually (jitter keeps them from restarting together)
+max_requests = int(os.getenv("MAX_REQUESTS", 10_000))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", 1_000))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", 30))
+timeout = int(os.getenv("WORKER_TIMEOUT", 60))
+
+keepalive = int(os.getenv("KEEPALIVE", 5))
+backlog = int(os.getenv("BACKLOG", 2048))
+
+accesslog = os.getenv("ACCESS_LOG", "-") or None
+errorlog = "-"
+
+# Prepared here rather than in on_starting: the config is read before preload_app imports the
+# app, and prometheus_client needs the directory to exist when the metrics module is imported.
+# Stale files from a previous run would be aggregated into the new metrics; a HUP reload re-reads
+# this file, so the directory is only wiped once per master process.
+_multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if _multiproc_dir and not os.getenv("_PROMETHEUS_MULTIPROC_PREPARED"):
+    shutil.rmtree(_multiproc_dir, ignore_errors=True)
+    os.makedirs(_multiproc_dir, exist_ok=True)
+    os.environ["_PROMETHEUS_MULTIPROC_PREPARED"] = "1"
+
+def post_fork(server, worker):
+    # The preloaded app must not carry connections across fork; they are created by the lifespan
+    from app.db.database import db
+    db.client = None
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,34 +1,29 @@
+import json
+import hashlib
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.core.config import settings
-from app.db.mongo import MongoUserDB
+from app.core.tokens import keyring
+from app.core.startup import startup
+from app.core.health import deep_health, HEALTHY
+from app.db.identity_map import IdentityMapMiddleware
 from app.api.v1.api import api_router
-from app.db.mongo_token_store import MongoRevokedTokenStore
 from app.core.exceptions import validation_exception_handler, http_exception_handler
-from app.db.database import connect_to_mongo, close_mongo_connection, get_database
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    await connect_to_mongo()
-    db = await get_database()
-
-    # Token cleanup index
-    token_store = MongoRevokedTokenStore(db)
-    await token_store.init_indexes()
-
-    # User email/id indexes
-    user_db = MongoUserDB(db)
-    await user_db.init_indexes()
+    # Startup: database, indexes, revocation filter and email workers
+    await startup.start()
 
     yield
 
     # Shutdown
-    await close_mongo_connection()
+    await startup.stop()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -48,6 +43,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request-scoped identity map for user reads
+app.add_middleware(IdentityMapMiddleware)
+
 #Custom exception handlers
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(HTTPException, http_exception_handler)
@@ -55,9 +53,18 @@ app.add_exception_handler(HTTPException, http_exception_handler)
 # Include routers
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-#Prometheus instrumentation
-if settings.DEBUG:
-    Instrumentator(should_group_status_codes=False).instrument(app).expose(app, endpoint=f"{settings.API_V1_STR}/metrics", tags=["metrics"], include_in_schema=False)
+# Public keys are fixed for the process lifetime, so the JWKS document is built once
+JWKS_BODY = json.dumps(keyring.jwks(), separators=(",", ":"))
+JWKS_ETAG = f'"{hashlib.sha256(JWKS_BODY.encode()).hexdigest()[:32]}"'
+
+#Prometheus instrumentation (multi-worker aggregation via PROMETHEUS_MULTIPROC_DIR, see app/core/metrics.py)
+METRICS_PATH = f"{settings.API_V1_STR}/metrics"
+instrumentator = Instrumentator(
+    should_group_status_codes=False,
+    excluded_handlers=["/health", "/health/deep", "/ready", METRICS_PATH]
+).instrument(app)
+if not settings.METRICS_PORT:
+    instrumentator.expose(app, endpoint=METRICS_PATH, tags=["metrics"], include_in_schema=False)
 
 @app.get(
     "/",
@@ -110,6 +117,91 @@ async def health_check():
     }
 
 
+@app.get(
+    "/health/deep",
+    summary="Deep health check",
+    description="Reports MongoDB ping latency, connection pool saturation, password hash queue depth and event-loop lag. Returns 503 when any probe is unhealthy or past its overload limit, so the instance can be taken out of rotation. Results are cached for `HEALTH_CACHE_SECONDS`.",
+    response_description="Overall status and per-probe results",
+    responses={
+        200: {
+            "description": "Healthy",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "status": "healthy",
+                        "version": "1.0.0",
+                        "ready": True,
+                        "checks": {
+                            "mongo": {"status": "healthy", "latencyMs": 1.2},
+                            "mongoPool": {"status": "healthy", "checkedOut": 3, "maxSize": 100, "saturation": 0.03},
+                            "hashPool": {"status": "healthy", "queueDepth": 1, "maxQueue": 64, "saturation": 0.016},
+                            "eventLoop": {"status": "healthy", "lagMs": 0.4}
+                        }
+                    }
+                }
+            }
+        },
+        503: {"description": "Unhealthy or overloaded; same body with the failing probes marked"}
+    },
+)
+async def deep_health_check():
+    result = await deep_health.check()
+    return JSONResponse(status_code=200 if result["status"] == HEALTHY else 503, content=result)
+
+
+@app.get(
+    "/ready",
+    summary="Readiness check",
+    description="Returns 200 once the database is connected and startup has finished, 503 before that. Load balancers should only route traffic to ready instances.",
+    response_description="Readiness status",
+    responses={
+        200: {
+            "description": "Ready to serve traffic",
+            "content": {"application/json": {"example": {"status": "ready", "indexes": True}}}
+        },
+        503: {
+            "description": "Still starting",
+            "content": {"application/json": {"example": {"status": "starting", "indexes": False}}}
+        }
+    },
+)
+async def readiness_check():
+    return JSONResponse(
+        status_code=200 if startup.ready else 503,
+        content={"status": startup.status, "indexes": startup.indexes_ready}
+    )
+
+
+@app.get(
+    "/.well-known/jwks.json",
+    summary="JSON Web Key Set",
+    description="Public keys used to sign access tokens, so other services can verify them locally. Empty when tokens are signed with a shared secret.",
+    response_description="JWKS document",
+    responses={
+        200: {
+            "description": "Published signing keys",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "keys": [{"kty": "RSA", "kid": "2025-07", "use": "sig", "alg": "RS256", "n": "...", "e": "AQAB"}]
+                    }
+                }
+            }
+        },
+        304: {"description": "Keys unchanged since the cached copy"}
+    },
+)
+async def jwks(request: Request):
+    headers = {
+        "Cache-Control": f"public, max-age={settings.JWKS_CACHE_MAX_AGE_SECONDS}",
+        "ETag": JWKS_ETAG
+    }
+    if request.headers.get("if-none-match") == JWKS_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(content=JWKS_BODY, media_type="application/json", headers=headers)
+
+
 if __name__ == "__main__":
+    # Local development only; production runs `gunicorn -c gunicorn.conf.py main:app`
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=settings.DEBUG) 
\ No newline at end of file
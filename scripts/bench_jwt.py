@@ -0,0 +1,73 @@
+"""Microbenchmark JWT encode/verify throughput per codec, with and without the payload cache.
+
+Usage:
+    python -m scripts.bench_jwt --iterations 20000 --algorithm HS256
+"""
+import time
+import hashlib
+import argparse
+from uuid import uuid4
+from datetime import datetime, timedelta, timezone
+
+from app.db.cache import TTLCache
+from app.core.jwt_codec import CODECS, get_codec
+
+SECRET = "benchmark-secret-key-with-at-least-32-chars"
+
+def sample_claims() -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "sub": str(uuid4()),
+        "userType": "owner",
+        "email": "bench@example.com",
+        "exp": now + timedelta(minutes=30),
+        "type": "access",
+        "jti": str(uuid4()),
+        "iat": now
+    }
+
+def ops_per_second(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+def bench_codec(name: str, algorithm: str, iterations: int) -> tuple[float, float, float]:
+    codec = get_codec(name)
+    claims = sample_claims()
+    token = codec.encode(claims, SECRET, algorithm=algorithm)
+
+    encode_ops = ops_per_second(lambda: codec.encode(claims, SECRET, algorithm=algorithm), iterations)
+    decode_ops = ops_per_second(lambda: codec.decode(token, SECRET, algorithms=[algorithm]), iterations)
+
+    # Mirrors app.core.tokens._decode_token once the token is cached
+    cache = TTLCache(1024, 0)
+    def cached_decode():
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        payload = cache.get(key)
+        if payload is None:
+            payload = codec.decode(token, SECRET, algorithms=[algorithm])
+            cache.set(key, payload, 60)
+        return payload.copy()
+
+    cached_ops = ops_per_second(cached_decode, iterations)
+    return encode_ops, decode_ops, cached_ops
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JWT codec throughput.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--algorithm", default="HS256")
+    parser.add_argument("--codecs", nargs="*", default=list(CODECS))
+    args = parser.parse_args()
+
+    print(f"{'codec':<8} {'encode/s':>12} {'verify/s':>12} {'cached verify/s':>16}")
+    for name in args.codecs:
+        try:
+            encode_ops, decode_ops, cached_ops = bench_codec(name, args.algorithm, args.iterations)
+        except ImportError as e:
+            print(f"{name:<8} skipped ({e})")
+            continue
+        print(f"{name:<8} {encode_ops:>12,.0f} {decode_ops:>12,.0f} {cached_ops:>16,.0f}")
+
+if __name__ == "__main__":
+    main()
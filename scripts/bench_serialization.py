@@ -0,0 +1,112 @@
+"""Compare per-request CPU of the old and fast response paths for /auth/login and /user/profile.
+
+The old path returns models/dicts through `response_model` (validated again, then encoded by
+the stdlib JSON encoder); the fast path validates once and returns `json_response(...)`.
+Requests are driven straight through the ASGI app, so no network or database is involved.
+
+Usage:
+    python -m scripts.bench_serialization --iterations 20000
+"""
+import os
+import time
+import asyncio
+import argparse
+from uuid import uuid4
+from datetime import datetime, timezone
+
+# Settings are loaded on import; fill in what a benchmark does not need
+for name, value in {
+    "DEBUG": "false", "SECRET_KEY": "benchmark-secret-key-with-at-least-32-chars", "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30", "RESET_TOKEN_EXPIRE_MINUTES": "15", "GMAIL_USER": "bench@example.com",
+    "GMAIL_PASS": "-", "FRONTEND_URL": "http://localhost", "RESET_PASSWORD_URL": "reset-password",
+}.items():
+    os.environ.setdefault(name, value)
+
+from fastapi import FastAPI
+
+from app.schemas.auth import UserLoginResponse
+from app.schemas.user import OwnerOut, ClinicOut
+from app.utils.response_builder import get_user_output_model, json_response
+
+TOKEN = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9." + "x" * 180 + ".signature"
+
+def sample_user() -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "id": str(uuid4()),
+        "name": "Clínica Vida",
+        "email": "contacto@vidaclinic.com",
+        "phone": "3001234567",
+        "address": "Carrera 9 #100-20",
+        "userType": "clinic",
+        "locality": "Usaquén",
+        "createdAt": now,
+        "updatedAt": now,
+        "password": "$2b$12$" + "h" * 53,
+    }
+
+def build_app(user: dict) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/old/login", response_model=UserLoginResponse)
+    async def old_login():
+        return {"success": True, "user": get_user_output_model(user), "token": TOKEN}
+
+    @app.get("/new/login", response_model=UserLoginResponse)
+    async def new_login():
+        return json_response(UserLoginResponse.model_construct(
+            success=True, token=TOKEN, refreshToken=None, user=get_user_output_model(user)
+        ))
+
+    @app.get("/old/profile", response_model=OwnerOut | ClinicOut)
+    async def old_profile():
+        return get_user_output_model(user)
+
+    @app.get("/new/profile", response_model=OwnerOut | ClinicOut)
+    async def new_profile():
+        return json_response(get_user_output_model(user))
+
+    return app
+
+async def request(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+async def microseconds_per_request(app: FastAPI, path: str, iterations: int) -> float:
+    for _ in range(min(iterations, 500)):
+        await request(app, path)
+    start = time.process_time()
+    for _ in range(iterations):
+        await request(app, path)
+    return (time.process_time() - start) / iterations * 1_000_000
+
+async def run(iterations: int):
+    app = build_app(sample_user())
+    print(f"{'endpoint':<16}{'old µs/req':>12}{'fast µs/req':>13}{'saved':>10}")
+    for endpoint in ("login", "profile"):
+        old = await microseconds_per_request(app, f"/old/{endpoint}", iterations)
+        new = await microseconds_per_request(app, f"/new/{endpoint}", iterations)
+        print(f"/{endpoint:<15}{old:>12.1f}{new:>13.1f}{(old - new) / old:>10.0%}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization paths.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Measure bcrypt latency on this host and suggest BCRYPT_ROUNDS.
+
+Usage:
+    python -m scripts.calibrate_bcrypt --target-ms 150 --samples 9
+"""
+import time
+import argparse
+import statistics
+from passlib.hash import bcrypt
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 16
+
+def measure_rounds(rounds: int, samples: int) -> float:
+    hasher = bcrypt.using(rounds=rounds)
+    durations = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash("CalibrationP@ssw0rd")
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+def calibrate(target_ms: float, samples: int) -> int:
+    selected = MIN_ROUNDS
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        p50 = measure_rounds(rounds, samples)
+        print(f"rounds={rounds:<2} p50={p50:8.1f} ms")
+        if p50 > target_ms:
+            break
+        selected = rounds
+    return selected
+
+def main():
+    parser = argparse.ArgumentParser(description="Pick the bcrypt cost factor that fits a latency budget.")
+    parser.add_argument("--target-ms", type=float, default=150.0, help="Target p50 hash latency in milliseconds")
+    parser.add_argument("--samples", type=int, default=9, help="Hashes measured per cost factor")
+    args = parser.parse_args()
+
+    rounds = calibrate(args.target_ms, args.samples)
+    print(f"\nAdd to your environment:\nBCRYPT_ROUNDS={rounds}")
+
+if __name__ == "__main__":
+    main()
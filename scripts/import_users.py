@@ -0,0 +1,65 @@
+"""Bulk import owners or clinics from an NDJSON or CSV file straight into MongoDB.
+
+Usage:
+    python -m scripts.import_users clinics.csv --user-type clinic --report report.ndjson
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Bulk import users from NDJSON or CSV.")
+    parser.add_argument("path", help="Input file (.csv, or NDJSON otherwise)")
+    parser.add_argument("--user-type", choices=["owner", "clinic"], required=True)
+    parser.add_argument("--report", help="Write the per-row report as NDJSON to this file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Hashing processes")
+    return parser.parse_args()
+
+async def run(args) -> int:
+    from app.schemas.user import UserType
+    from app.db.mongo import MongoUserDB
+    from app.core.security import shutdown_hash_executor
+    from app.services.import_service import iter_records, import_users, CSV, NDJSON
+    from app.db.database import connect_to_mongo, close_mongo_connection, get_database
+
+    async def read_file():
+        with open(args.path, "rb") as f:
+            while chunk := f.read(1 << 16):
+                yield chunk
+
+    fmt = CSV if args.path.lower().endswith(".csv") else NDJSON
+
+    await connect_to_mongo()
+    try:
+        user_db = MongoUserDB(await get_database())
+        await user_db.init_indexes()
+        report = await import_users(iter_records(read_file(), fmt), fmt, UserType(args.user_type), user_db)
+    finally:
+        shutdown_hash_executor()
+        await close_mongo_connection()
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            for result in report["results"]:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    else:
+        for result in report["results"]:
+            if not result["success"]:
+                print(json.dumps(result, ensure_ascii=False))
+
+    print(f"Imported {report['imported']}, failed {report['failed']}", file=sys.stderr)
+    return 0 if report["failed"] == 0 else 1
+
+def main():
+    args = parse_args()
+    # Offline imports own the machine: hash on every core in separate processes
+    os.environ.setdefault("PASSWORD_HASH_EXECUTOR", "process")
+    os.environ.setdefault("PASSWORD_HASH_WORKERS", str(args.workers))
+    os.environ.setdefault("PASSWORD_HASH_MAX_QUEUE", str(args.workers * 4))
+    os.environ.setdefault("IMPORT_HASH_PARALLELISM", str(args.workers))
+    sys.exit(asyncio.run(run(args)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Offline load test: seed users, drive a mixed workload at fixed concurrency, report latency per endpoint.
+
+Runs the app in-process against the configured MongoDB (or an in-memory stand-in with
+`--in-memory`, which needs `pip install mongomock-motor`), or against a running server with
+`--target`. In-process runs disable login throttling; for `--target`, disable or raise it on the server.
+
+Usage:
+    python -m scripts.loadtest --users 2000 --concurrency 50 --duration 30
+    python -m scripts.loadtest --in-memory --save-baseline loadtest-baseline.json
+    python -m scripts.loadtest --target http://localhost:8000 --baseline loadtest-baseline.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+
+# Every virtual user logs in from the same address, which the throttle would stop
+os.environ.setdefault("LOGIN_THROTTLE_ENABLED", "false")
+
+import httpx
+
+from app.core.config import settings
+from app.db.mongo import MongoUserDB
+from app.core.security import hash_password, shutdown_hash_executor
+from app.services.auth_service import build_user_document
+from app.schemas.user import UserType, Locality, OwnerRegister, ClinicRegister
+
+PASSWORD = "LoadTest123"
+EMAIL_PREFIX = "loadtest-"
+SEED_CHUNK_SIZE = 1000
+
+ENDPOINTS = ("login", "verify-token", "profile-get", "profile-patch", "logout")
+DEFAULT_MIX = "login=15,verify-token=40,profile-get=25,profile-patch=15,logout=5"
+
+def seed_email(i: int) -> str:
+    return f"{EMAIL_PREFIX}{i}@example.com"
+
+async def seed_users(user_db: MongoUserDB, count: int):
+    # One bcrypt hash (at the server's cost) shared by every user keeps seeding fast
+    hashed = hash_password(PASSWORD)
+    await user_db.collection.delete_many({"email": {"$regex": f"^{EMAIL_PREFIX}"}})
+
+    localities = list(Locality)
+    for start in range(0, count, SEED_CHUNK_SIZE):
+        docs = []
+        for i in range(start, min(start + SEED_CHUNK_SIZE, count)):
+            fields = {
+                "name": f"Load Test {i}", "email": seed_email(i), "password": PASSWORD,
+                "confirmPassword": PASSWORD, "phone": "3001234567", "address": f"Calle {i} #1-23"
+            }
+            if i % 2:
+                data, user_type = ClinicRegister(**fields, locality=localities[i % len(localities)]), UserType.CLINIC
+            else:
+                data, user_type = OwnerRegister(**fields), UserType.OWNER
+            docs.append(build_user_document(data, user_type, hashed))
+        await user_db.create_many(docs)
+
+def parse_mix(mix: str) -> dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, weight = part.split("=")
+        if name.strip() not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name.strip()}', expected one of {', '.join(ENDPOINTS)}")
+        weights[name.strip()] = float(weight)
+    return weights
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.recording = False
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        if not self.recording:
+            return
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+async def virtual_user(client: httpx.AsyncClient, user_count: int, mix: dict[str, float], recorder: Recorder, stop: asyncio.Event):
+    rng = random.Random()
+    names, weights = list(mix), list(mix.values())
+    api = settings.API_V1_STR
+    token = None
+
+    while not stop.is_set():
+        endpoint = "login" if token is None else rng.choices(names, weights)[0]
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+        start = time.perf_counter()
+        try:
+            if endpoint == "login":
+                response = await client.post(f"{api}/auth/login", json={"email": seed_email(rng.randrange(user_count)), "password": PASSWORD})
+            elif endpoint == "verify-token":
+                response = await client.post(f"{api}/auth/verify-token", headers=headers)
+            elif endpoint == "profile-get":
+                response = await client.get(f"{api}/user/profile", headers=headers)
+            elif endpoint == "profile-patch":
+                response = await client.patch(f"{api}/user/profile", headers=headers, json={"address": f"Calle {rng.randrange(1000)} #1-23"})
+            else:
+                response = await client.post(f"{api}/auth/logout", headers=headers)
+        except httpx.HTTPError:
+            recorder.record(endpoint, time.perf_counter() - start, False)
+            token = None
+            continue
+        recorder.record(endpoint, time.perf_counter() - start, response.status_code < 400)
+
+        if endpoint == "login":
+            token = response.json().get("token") if response.status_code == 200 else None
+        elif endpoint == "logout" or response.status_code == 401:
+            token = None
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    # Nearest-rank percentile
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+def summarize(recorder: Recorder, duration: float) -> dict:
+    endpoints = {}
+    for endpoint, latencies in sorted(recorder.latencies.items()):
+        latencies.sort()
+        endpoints[endpoint] = {
+            "requests": len(latencies),
+            "errors": recorder.errors.get(endpoint, 0),
+            "rps": round(len(latencies) / duration, 2),
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+        }
+    return endpoints
+
+def print_report(endpoints: dict):
+    print(f"{'endpoint':<15}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for endpoint, s in endpoints.items():
+        print(f"{endpoint:<15}{s['requests']:>10}{s['errors']:>8}{s['rps']:>10.1f}{s['p50']:>10.2f}{s['p95']:>10.2f}{s['p99']:>10.2f}")
+
+def compare(endpoints: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for endpoint, base in baseline["endpoints"].items():
+        current = endpoints.get(endpoint)
+        if current is None:
+            regressions.append(f"{endpoint}: no requests recorded")
+            continue
+        for metric in ("p50", "p95", "p99"):
+            if current[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{endpoint}: {metric} {current[metric]:.2f} ms vs baseline {base[metric]:.2f} ms")
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint}: {current['rps']:.1f} req/s vs baseline {base['rps']:.1f} req/s")
+        if current["errors"] / current["requests"] > base["errors"] / max(base["requests"], 1) + 0.001:
+            regressions.append(f"{endpoint}: error rate {current['errors']}/{current['requests']} vs baseline {base['errors']}/{base['requests']}")
+    return regressions
+
+async def connect(args) -> MongoUserDB:
+    from app.db.database import db, connect_to_mongo, get_database
+
+    if args.in_memory:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("--in-memory needs mongomock-motor: pip install mongomock-motor")
+        db.client = AsyncMongoMockClient()
+    else:
+        await connect_to_mongo()
+    return MongoUserDB(await get_database())
+
+async def run(args) -> int:
+    user_db = await connect(args)
+    await user_db.init_indexes()
+    if not args.skip_seed:
+        started = time.perf_counter()
+        await seed_users(user_db, args.users)
+        print(f"Seeded {args.users} users in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    if args.target:
+        client = httpx.AsyncClient(base_url=args.target, limits=httpx.Limits(max_connections=args.concurrency), timeout=30)
+        stop_app = None
+    else:
+        from main import app
+        from app.db.dependencies import init_indexes, get_revoked_token_store
+
+        # The database is already connected (or in memory); bring up what request handlers rely on
+        await init_indexes()
+        token_store = await get_revoked_token_store()
+        await token_store.start_filter_sync()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=30)
+        stop_app = token_store.stop_filter_sync
+
+    recorder = Recorder()
+    stop = asyncio.Event()
+    mix = parse_mix(args.mix)
+    users = [asyncio.create_task(virtual_user(client, args.users, mix, recorder, stop)) for _ in range(args.concurrency)]
+
+    await asyncio.sleep(args.warmup)
+    recorder.recording = True
+    await asyncio.sleep(args.duration)
+    recorder.recording = False
+    stop.set()
+    await asyncio.gather(*users)
+    await client.aclose()
+    if stop_app:
+        await stop_app()
+    shutdown_hash_executor()
+
+    endpoints = summarize(recorder, args.duration)
+    print_report(endpoints)
+    result = {
+        "config": {"users": args.users, "concurrency": args.concurrency, "duration": args.duration, "mix": args.mix, "target": args.target or "in-process"},
+        "endpoints": endpoints
+    }
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(endpoints, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test login, token verification and profile endpoints.")
+    parser.add_argument("--users", type=int, default=1000, help="Owners and clinics to seed (half each)")
+    parser.add_argument("--concurrency", type=int, default=50, help="Virtual users running in parallel")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before measuring")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Endpoint weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--target", help="Base URL of a running server; in-process when omitted")
+    parser.add_argument("--in-memory", action="store_true", help="Use an in-memory MongoDB stand-in (in-process only)")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse users from a previous run")
+    parser.add_argument("--baseline", help="Compare against this results file and exit 1 on regressions")
+    parser.add_argument("--save-baseline", help="Write this run's results to this file")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative change before flagging")
+    args = parser.parse_args()
+
+    if args.in_memory and args.target:
+        parser.error("--in-memory only applies to in-process runs")
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    sys.exit(asyncio.run(run(args)))
+
+if __name__ == "__main__":
+    main()
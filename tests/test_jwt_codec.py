@@ -0,0 +1,154 @@
+import json
+import time
+import base64
+from enum import Enum
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from jose.exceptions import ExpiredSignatureError, JWTError
+
+from app.core.jwt_codec import JoseCodec, HmacCodec
+
+SECRET = "x" * 32
+HS_ALGORITHMS = ["HS256", "HS384", "HS512"]
+
+class Kind(str, Enum):
+    ACCESS = "access"
+
+def b64(data: dict | bytes) -> str:
+    if isinstance(data, dict):
+        data = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def claims(**overrides) -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "sub": "user-1",
+        "email": "owner@example.com",
+        "type": Kind.ACCESS,
+        "exp": now + timedelta(minutes=5),
+        "iat": now,
+        **overrides,
+    }
+
+@pytest.fixture
+def hmac_codec():
+    return HmacCodec()
+
+@pytest.mark.parametrize("algorithm", HS_ALGORITHMS)
+@pytest.mark.parametrize("headers", [None, {"kid": "2024-01"}])
+def test_encode_matches_jose_byte_for_byte(hmac_codec, algorithm, headers):
+    payload = claims()
+    assert hmac_codec.encode(payload, SECRET, algorithm, headers) == JoseCodec().encode(payload, SECRET, algorithm, headers)
+
+@pytest.mark.parametrize("algorithm", HS_ALGORITHMS)
+def test_tokens_decode_across_codecs(hmac_codec, algorithm):
+    jose_codec = JoseCodec()
+    payload = claims()
+
+    expected = jose_codec.decode(jose_codec.encode(payload, SECRET, algorithm), SECRET, [algorithm])
+    assert hmac_codec.decode(jose_codec.encode(payload, SECRET, algorithm), SECRET, [algorithm]) == expected
+    assert jose_codec.decode(hmac_codec.encode(payload, SECRET, algorithm), SECRET, [algorithm]) == expected
+
+def test_unverified_header_matches_jose(hmac_codec):
+    token = hmac_codec.encode(claims(), SECRET, "HS256", {"kid": "k1"})
+    assert hmac_codec.get_unverified_header(token) == JoseCodec().get_unverified_header(token)
+
+def test_tampered_signature_is_rejected(hmac_codec):
+    header, payload, signature = hmac_codec.encode(claims(), SECRET, "HS256").split(".")
+    flipped = ("A" if signature[0] != "A" else "B") + signature[1:]
+    with pytest.raises(JWTError):
+        hmac_codec.decode(f"{header}.{payload}.{flipped}", SECRET, ["HS256"])
+
+def test_tampered_payload_is_rejected(hmac_codec):
+    header, _, signature = hmac_codec.encode(claims(), SECRET, "HS256").split(".")
+    forged = b64({"sub": "admin", "exp": int(time.time()) + 300})
+    with pytest.raises(JWTError):
+        hmac_codec.decode(f"{header}.{forged}.{signature}", SECRET, ["HS256"])
+
+def test_wrong_key_is_rejected(hmac_codec):
+    token = hmac_codec.encode(claims(), SECRET, "HS256")
+    with pytest.raises(JWTError):
+        hmac_codec.decode(token, "y" * 32, ["HS256"])
+
+@pytest.mark.parametrize("alg", ["none", "None", "NONE"])
+def test_alg_none_is_rejected(hmac_codec, alg):
+    token = f"{b64({'alg': alg, 'typ': 'JWT'})}.{b64({'sub': 'user-1'})}."
+    with pytest.raises(JWTError):
+        hmac_codec.decode(token, SECRET, ["HS256"])
+
+def test_header_algorithm_outside_allowed_list_is_rejected(hmac_codec):
+    token = hmac_codec.encode(claims(), SECRET, "HS512")
+    with pytest.raises(JWTError):
+        hmac_codec.decode(token, SECRET, ["HS256"])
+
+def test_asymmetric_header_algorithm_is_rejected(hmac_codec):
+    # An RS256 header must never be verified as an HMAC over the configured key
+    _, payload, signature = hmac_codec.encode(claims(), SECRET, "HS256").split(".")
+    token = f"{b64({'alg': 'RS256', 'typ': 'JWT'})}.{payload}.{signature}"
+    with pytest.raises(JWTError):
+        hmac_codec.decode(token, SECRET, ["HS256"])
+    with pytest.raises(JWTError):
+        hmac_codec.decode(token, SECRET, ["RS256"])
+
+def test_encode_rejects_non_hmac_algorithm(hmac_codec):
+    with pytest.raises(JWTError):
+        hmac_codec.encode(claims(), SECRET, "RS256")
+
+@pytest.mark.parametrize("token", [
+    "",
+    "abc",
+    "abc.def",
+    "a.b.c.d",
+    "!!!.???.***",
+    "é.é.é",
+    f"{b64(b'not json')}.{b64({'sub': 'user-1'})}.sig",
+    f"{b64(b'[1, 2]')}.{b64({'sub': 'user-1'})}.sig",
+    f"{b64({'typ': 'JWT'})}.{b64({'sub': 'user-1'})}.sig",
+])
+def test_malformed_tokens_are_rejected(hmac_codec, token):
+    with pytest.raises(JWTError):
+        hmac_codec.decode(token, SECRET, ["HS256"])
+
+@pytest.mark.parametrize("payload", [b"not json", b"[1, 2]", b'"user-1"'])
+def test_correctly_signed_non_object_payload_is_rejected(hmac_codec, payload):
+    # Signed with the right key, so only payload validation can reject it
+    header = hmac_codec._header("HS256", None)
+    signing_input = header + b"." + b64(payload).encode()
+    signer = hmac_codec._signer(SECRET, "HS256")
+    signer.update(signing_input)
+    token = (signing_input + b"." + b64(signer.digest()).encode()).decode()
+    with pytest.raises(JWTError):
+        hmac_codec.decode(token, SECRET, ["HS256"])
+
+def test_malformed_header_is_rejected_without_verification(hmac_codec):
+    with pytest.raises(JWTError):
+        hmac_codec.get_unverified_header("!!!.abc.def")
+
+def test_expired_token_raises_expired_signature(hmac_codec):
+    token = hmac_codec.encode(claims(exp=datetime.now(timezone.utc) - timedelta(seconds=1)), SECRET, "HS256")
+    with pytest.raises(ExpiredSignatureError):
+        hmac_codec.decode(token, SECRET, ["HS256"])
+
+def test_unexpired_token_decodes(hmac_codec):
+    exp = int(time.time()) + 60
+    token = hmac_codec.encode(claims(exp=exp), SECRET, "HS256")
+    assert hmac_codec.decode(token, SECRET, ["HS256"])["exp"] == exp
+
+def test_non_numeric_exp_is_rejected(hmac_codec):
+    token = hmac_codec.encode(claims(exp="tomorrow"), SECRET, "HS256")
+    with pytest.raises(JWTError) as excinfo:
+        hmac_codec.decode(token, SECRET, ["HS256"])
+    assert not isinstance(excinfo.value, ExpiredSignatureError)
+
+def test_future_nbf_is_rejected(hmac_codec):
+    token = hmac_codec.encode(claims(nbf=int(time.time()) + 60), SECRET, "HS256")
+    with pytest.raises(JWTError):
+        hmac_codec.decode(token, SECRET, ["HS256"])
+
+def test_expiry_matches_jose(hmac_codec):
+    token = hmac_codec.encode(claims(exp=int(time.time()) - 1), SECRET, "HS256")
+    with pytest.raises(ExpiredSignatureError):
+        JoseCodec().decode(token, SECRET, ["HS256"])
+    with pytest.raises(ExpiredSignatureError):
+        hmac_codec.decode(token, SECRET, ["HS256"])